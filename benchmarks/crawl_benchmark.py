@@ -0,0 +1,238 @@
+"""
+End-to-end crawl throughput: ReconScraper.crawl() against local synthetic sites.
+
+Usage:
+    python benchmarks/crawl_benchmark.py                        # every scenario
+    python benchmarks/crawl_benchmark.py --scenario slow-server --repeat 5
+    python benchmarks/crawl_benchmark.py --scenario custom --pages 1000 --page-size 50 --fanout 20
+    python benchmarks/crawl_benchmark.py --save-baseline        # record the reference numbers
+
+Each scenario serves a site generated by mock_site.py from a separate process,
+so the server's own work is not measured. Every run crawls it from a fresh
+process and reports pages/sec, peak RSS and CPU time per page (parse workers
+included); the median run by throughput is kept. Results are compared with the
+baseline file, and the exit status is 1 when a metric regressed by more than
+the tolerance, so the benchmark can gate performance changes. The committed
+crawl_baseline.json comes from one development machine; re-record it with
+--save-baseline on the machine the comparison runs on.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.join(BENCHMARK_DIR, '..', 'recon_scraper')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'crawl_baseline.json')
+
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_site import add_site_arguments  # noqa: E402
+
+SCENARIOS = {
+    "small-pages": {"pages": 300, "page_size": 5, "fanout": 10, "latency": 0.005, "error_rate": 0.0},
+    "large-pages": {"pages": 150, "page_size": 300, "fanout": 10, "latency": 0.005, "error_rate": 0.0},
+    "slow-server": {"pages": 200, "page_size": 20, "fanout": 10, "latency": 0.2, "error_rate": 0.0},
+    "flaky-server": {"pages": 200, "page_size": 20, "fanout": 10, "latency": 0.02, "error_rate": 0.05},
+}
+
+# Metric -> True if higher is better
+METRICS = {"pages_per_second": True, "peak_rss_mb": False, "cpu_ms_per_page": False}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_site(site, port, timeout=10.0):
+    """Start mock_site.py in a subprocess and wait until it accepts connections."""
+    command = [sys.executable, os.path.join(BENCHMARK_DIR, 'mock_site.py'), '--port', str(port),
+               '--pages', str(site["pages"]), '--page-size', str(site["page_size"]),
+               '--fanout', str(site["fanout"]), '--latency', str(site["latency"]),
+               '--error-rate', str(site["error_rate"]), '--seed', str(site.get("seed", 1))]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Mock site did not start on port {port}")
+
+
+def run_crawl(url, site, args):
+    """Crawl the site from a fresh process, so peak RSS and CPU time belong to this run only."""
+    config = {
+        "url": url,
+        "max_urls": site["pages"],
+        "depth": args.depth,
+        "concurrency": args.concurrency,
+        "parse_workers": args.parse_workers,
+        "parser": args.parser,
+    }
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', json.dumps(config)],
+                            capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Crawl failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child(config):
+    """Run one crawl in this process and print its measurements as JSON."""
+    workdir = tempfile.mkdtemp(prefix="crawl_benchmark_")
+    os.chdir(workdir)  # scraper.log and the result files stay out of the tree
+    sys.path.insert(0, os.path.abspath(SCRAPER_DIR))
+
+    import asyncio
+    from rich.console import Console
+    from recon_scraper import ReconScraper
+
+    scraper = ReconScraper(
+        target_url=config["url"],
+        keywords=["secret", "password"],
+        depth=config["depth"],
+        output_dir=os.path.join(workdir, "results"),
+        max_urls=config["max_urls"],
+        ignore_robots=True,
+        concurrency=config["concurrency"],
+        delay=0,
+        parser_backend=config["parser"],
+        parse_workers=config["parse_workers"],
+        show_progress=False,
+        quiet=True,
+    )
+    scraper.console = Console(quiet=True)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    try:
+        asyncio.run(scraper.crawl())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    # Parse workers have exited once the crawl returns, so their usage is available
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu += children.ru_utime + children.ru_stime
+
+    pages = len(scraper.visited_urls)
+    print(json.dumps({
+        "pages": pages,
+        "findings": scraper.sink.pages,
+        "elapsed": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "cpu_ms_per_page": cpu * 1000 / pages if pages else 0.0,
+    }))
+
+
+def run_scenario(name, site, args):
+    port = free_port()
+    process = start_site(site, port)
+    try:
+        runs = [run_crawl(f"http://127.0.0.1:{port}/", site, args) for _ in range(args.repeat)]
+    finally:
+        process.terminate()
+        process.wait()
+    runs.sort(key=lambda run: run["pages_per_second"])
+    result = runs[len(runs) // 2]
+    print(f"{name:<14} {result['pages']:6d} pages {result['elapsed']:7.2f}s "
+          f"{result['pages_per_second']:8.1f} pages/s {result['peak_rss_mb']:7.1f} MB "
+          f"{result['cpu_ms_per_page']:7.2f} ms CPU/page")
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of every metric against the baseline; return the regressions."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<14} no baseline")
+            continue
+        changes = []
+        for metric, higher_is_better in METRICS.items():
+            if not reference.get(metric):
+                continue
+            change = (result[metric] - reference[metric]) / reference[metric]
+            changes.append(f"{metric} {change:+.1%}")
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {reference[metric]:.2f} -> {result[metric]:.2f}")
+        print(f"{name:<14} {', '.join(changes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end crawl throughput on synthetic sites')
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS) + ['custom'],
+                        help='Scenario to run, repeatable (default: all presets). '
+                             '"custom" uses the site options below')
+    add_site_arguments(parser)
+    parser.add_argument('--depth', type=int, default=10, help='Crawl depth (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=10, help='Crawl concurrency (default: 10)')
+    parser.add_argument('--parse-workers', type=int, default=0, help='Parse worker processes (default: 0)')
+    parser.add_argument('--parser', default=None, help='HTML parser backend (default: fastest available)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario, the median is kept (default: 3)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Relative regression that fails the run (default: 0.10)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(json.loads(args.child))
+        return
+
+    scenarios = {}
+    for name in args.scenario or list(SCENARIOS):
+        if name == 'custom':
+            scenarios[name] = {"pages": args.pages, "page_size": args.page_size, "fanout": args.fanout,
+                               "latency": args.latency, "error_rate": args.error_rate, "seed": args.seed}
+        else:
+            scenarios[name] = SCENARIOS[name]
+
+    print(f"concurrency {args.concurrency}, parse workers {args.parse_workers}, "
+          f"median of {args.repeat} run(s)")
+    results = {name: run_scenario(name, site, args) for name, site in scenarios.items()}
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
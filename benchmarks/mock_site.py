@@ -0,0 +1,122 @@
+"""
+Synthetic website for crawl benchmarks, served locally with aiohttp.
+
+Usage:
+    python benchmarks/mock_site.py --port 8900 --pages 500 --page-size 20 --fanout 10
+
+Page 0 is served at `/` and page i at `/page/<i>`. Every page links to the
+next one, so the whole site is reachable, plus `fanout - 1` pages picked at
+random. Pages are padded with filler text to about `page-size` KB and contain
+a few occurrences of the keywords "secret" and "password". The content, the
+links and the pages answering with an error only depend on the seed, so two
+runs with the same options serve exactly the same site.
+"""
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+WORDS = ["admin", "login", "internal", "network", "report", "server", "session", "public", "service"]
+KEYWORDS = ["secret", "password"]
+
+
+class MockSite:
+    """Deterministic synthetic site."""
+
+    def __init__(self, pages=200, page_size=20, fanout=10, latency=0.01, error_rate=0.0, seed=1):
+        """
+        Args:
+            pages (int): Number of pages
+            page_size (float): Approximate page size in KB
+            fanout (int): Links per page
+            latency (float): Seconds every response is delayed by
+            error_rate (float): Fraction of pages answering 500
+            seed (int): Seed of the generated content
+        """
+        self.pages = pages
+        self.page_size = page_size
+        self.fanout = fanout
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        rng = random.Random(seed)
+        self.failing = {i for i in range(1, pages) if rng.random() < error_rate}
+        self._cache = {}
+
+    def render(self, index):
+        """Build the HTML of a page (memoized, so the server's own cost stays low)."""
+        html = self._cache.get(index)
+        if html is not None:
+            return html
+        rng = random.Random(self.seed * 1000003 + index)
+        links = [(index + 1) % self.pages]
+        links += [rng.randrange(self.pages) for _ in range(max(self.fanout - 1, 0))]
+        anchors = "".join(f'<a href="{self.path(target)}">page {target}</a> ' for target in links)
+
+        paragraphs = []
+        size = len(anchors)
+        target_size = int(self.page_size * 1024)
+        while size < target_size:
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30)))
+            if rng.random() < 0.05:
+                sentence += " " + rng.choice(KEYWORDS)
+            paragraph = f"<p>{sentence}</p>"
+            paragraphs.append(paragraph)
+            size += len(paragraph)
+        html = (f"<html><head><title>Page {index}</title></head><body>"
+                f"<p>{KEYWORDS[index % len(KEYWORDS)]} page {index}</p>{''.join(paragraphs)}"
+                f"<nav>{anchors}</nav></body></html>")
+        self._cache[index] = html
+        return html
+
+    @staticmethod
+    def path(index):
+        return "/" if index == 0 else f"/page/{index}"
+
+    async def handle_page(self, request):
+        index = int(request.match_info.get("index", 0))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not 0 <= index < self.pages:
+            return web.Response(status=404, text="Not found")
+        if index in self.failing:
+            return web.Response(status=500, text="Internal error")
+        return web.Response(text=self.render(index), content_type="text/html")
+
+    async def handle_robots(self, request):
+        return web.Response(text="User-agent: *\nAllow: /\n", content_type="text/plain")
+
+    def app(self):
+        """Build the aiohttp application serving the site."""
+        app = web.Application()
+        app.router.add_get("/", self.handle_page)
+        app.router.add_get("/page/{index:\\d+}", self.handle_page)
+        app.router.add_get("/robots.txt", self.handle_robots)
+        return app
+
+
+def add_site_arguments(parser):
+    """Add the options describing a synthetic site to an argument parser."""
+    parser.add_argument('--pages', type=int, default=200, help='Number of pages (default: 200)')
+    parser.add_argument('--page-size', type=float, default=20, help='Page size in KB (default: 20)')
+    parser.add_argument('--fanout', type=int, default=10, help='Links per page (default: 10)')
+    parser.add_argument('--latency', type=float, default=0.01, help='Response delay in seconds (default: 0.01)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of pages answering 500 (default: 0)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the generated content (default: 1)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic website for crawl benchmarks')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8900, help='Port to listen on (default: 8900)')
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    site = MockSite(args.pages, args.page_size, args.fanout, args.latency, args.error_rate, args.seed)
+    print(f"Serving {args.pages} pages on http://{args.host}:{args.port}/", flush=True)
+    web.run_app(site.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
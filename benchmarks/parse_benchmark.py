@@ -0,0 +1,108 @@
+"""
+Per-page HTML processing cost: legacy double parse vs. single-parse pipeline.
+
+Usage:
+    python benchmarks/parse_benchmark.py --corpus saved_pages/
+    python benchmarks/parse_benchmark.py --synthetic 50
+
+The corpus is a directory of saved pages (*.html / *.htm). Every available
+backend is timed on the same pages and compared with the legacy pipeline,
+which built two BeautifulSoup trees per page (one for text, one for links).
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'recon_scraper'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from page_parser import AVAILABLE_BACKENDS, parse_page  # noqa: E402
+
+BASE_URL = "https://example.com/"
+
+
+def legacy_process(html, url):
+    """Reproduce the pre-pipeline cost: one parse for text/title, one for links."""
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text()
+    title_tag = soup.find('title')
+    title = title_tag.text if title_tag else "No title"
+
+    soup = BeautifulSoup(html, 'html.parser')
+    domain = urlparse(url).netloc
+    links = []
+    for a_tag in soup.find_all('a', href=True):
+        full_url = urljoin(url, a_tag['href'])
+        if urlparse(full_url).netloc == domain:
+            links.append(full_url)
+    return text, title, list(set(links))
+
+
+def load_corpus(path):
+    pages = []
+    for pattern in ("*.html", "*.htm"):
+        for filename in sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)):
+            with open(filename, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+    return pages
+
+
+def synthetic_corpus(count, seed=1):
+    rng = random.Random(seed)
+    words = ["admin", "password", "login", "internal", "token", "security", "server", "network", "report"]
+    pages = []
+    for i in range(count):
+        paragraphs = []
+        for _ in range(rng.randint(50, 400)):
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 30)))
+            link = f'<a href="/page/{rng.randint(0, 10000)}?ref={i}">more</a>'
+            paragraphs.append(f"<div class='c'><p>{sentence} {link}</p></div>")
+        pages.append(f"<html><head><title>Page {i}</title><script>var x = {i};</script></head>"
+                     f"<body>{''.join(paragraphs)}</body></html>")
+    return pages
+
+
+def time_pipeline(func, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            func(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-page HTML processing cost')
+    parser.add_argument('--corpus', help='Directory of saved HTML pages')
+    parser.add_argument('--synthetic', type=int, default=0, help='Generate N synthetic pages instead of a corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions, best run is reported (default: 3)')
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        pages = synthetic_corpus(args.synthetic or 50)
+    if not pages:
+        parser.error("No pages found in corpus")
+
+    total_kb = sum(len(html) for html in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb / len(pages):.1f} KB/page on average")
+
+    domain = urlparse(BASE_URL).netloc
+    baseline = time_pipeline(lambda html: legacy_process(html, BASE_URL), pages, args.repeat)
+    print(f"{'legacy (2x html.parser)':<28} {baseline * 1000:8.2f} ms/page")
+
+    for backend in AVAILABLE_BACKENDS:
+        cost = time_pipeline(lambda html: parse_page(html, BASE_URL, domain, backend), pages, args.repeat)
+        print(f"{'single parse (' + backend + ')':<28} {cost * 1000:8.2f} ms/page  {baseline / cost:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
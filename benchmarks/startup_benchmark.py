@@ -0,0 +1,124 @@
+"""
+Fixed startup cost: module import time, CLI start and per-scan setup.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --repeat 20 --top 15
+
+Import times come from `python -X importtime` in fresh processes, so nothing is
+cached between runs; the slowest imports pulled in by recon_scraper are listed
+to show what a short scan pays before its first request. CLI start is the wall
+time of `recon_scraper.py --help` minus that of an empty interpreter. Per-scan
+setup is the time to build a ReconScraper, which the web interface does for
+every submitted scan. Medians of `--repeat` runs are reported.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.abspath(os.path.join(BENCHMARK_DIR, '..', 'recon_scraper'))
+
+# Modules loaded by the CLI and by the web interface's scan jobs
+MODULES = ["recon_scraper", "jobs"]
+
+ENV = dict(os.environ, PYTHONPATH=SCRAPER_DIR)
+
+
+def import_times(module, workdir):
+    """Import a module in a fresh process; return {imported module: cumulative microseconds}."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}' if module else 'pass'],
+                            cwd=workdir, env=ENV, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def wall_time(command, workdir):
+    """Run a command and return its wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run(command, cwd=workdir, env=ENV, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def child(repeat):
+    """Build scrapers in this process and print their construction times as JSON."""
+    workdir = os.getcwd()
+    sys.path.insert(0, SCRAPER_DIR)
+
+    from recon_scraper import ReconScraper
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ReconScraper(target_url="https://example.com/", keywords=["secret"],
+                     output_dir=os.path.join(workdir, "results"), show_progress=False, quiet=True)
+        times.append(time.perf_counter() - start)
+    print(json.dumps({"first": times[0], "next": statistics.median(times[1:]) if repeat > 1 else times[0],
+                      "output_dir_created": os.path.exists(os.path.join(workdir, "results"))}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark import time and per-scan setup cost')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Runs per measurement, the median is kept (default: 10)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports listed (default: 10)')
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    # Processes run in a scratch directory: importing the scraper opens scraper.log in the working directory
+    workdir = tempfile.mkdtemp(prefix="startup_benchmark_")
+    try:
+        run_benchmark(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmark(args, workdir):
+    print(f"median of {args.repeat} run(s)\n")
+    interpreter = import_times(None, workdir)  # Modules every interpreter loads (site, .pth hooks), not ours
+    slowest = {}
+    for module in MODULES:
+        runs = [import_times(module, workdir) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs)
+        print(f"import {module:<20} {total / 1000:8.1f} ms")
+        if module == MODULES[0]:
+            slowest = {name: statistics.median(run.get(name, 0) for run in runs) for name in runs[0]}
+
+    empty = statistics.median(wall_time([sys.executable, '-c', 'pass'], workdir) for _ in range(args.repeat))
+    cli_command = [sys.executable, os.path.join(SCRAPER_DIR, 'recon_scraper.py'), '--help']
+    cli = statistics.median(wall_time(cli_command, workdir) for _ in range(args.repeat))
+    print(f"CLI start (--help)          {(cli - empty) * 1000:8.1f} ms over an empty interpreter "
+          f"({empty * 1000:.1f} ms)")
+
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(args.repeat)],
+                            cwd=workdir, capture_output=True, text=True, check=True)
+    setup = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"ReconScraper() first        {setup['first'] * 1000:8.2f} ms")
+    print(f"ReconScraper() next         {setup['next'] * 1000:8.2f} ms")
+    if setup["output_dir_created"]:
+        print("  note: the output directory was created before any result was written")
+
+    print(f"\nSlowest imports under {MODULES[0]} (cumulative):")
+    ranked = sorted(((time_us, name) for name, time_us in slowest.items()
+                     if name != MODULES[0] and name not in interpreter), reverse=True)
+    for time_us, name in ranked[:args.top]:
+        print(f"  {name:<36} {time_us / 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
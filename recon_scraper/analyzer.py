@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+from detectors import DetectorSet
+from fetch_policy import is_binary_url
+from keyword_matcher import KeywordMatcher
+from page_parser import parse_page
+
+
+class PageAnalyzer:
+    """
+    CPU-bound part of processing a page: parsing, keyword matching and detectors.
+
+    It holds no crawl state, so the same analysis can run inline on the event
+    loop or inside a worker process.
+    """
+
+    def __init__(self, keywords, base_domain, parser_backend=None, skip_binary_links=False, detectors=None):
+        """
+        Args:
+            keywords (list): Keywords to search
+            base_domain (str): Only links on this netloc are returned (None: the netloc of each page)
+            parser_backend (str): HTML parser backend (default: fastest installed)
+            skip_binary_links (bool): Drop links to files with a binary extension (images, archives, ...)
+            detectors (list): Detector objects run on each page, reported like keywords
+        """
+        self.keywords = keywords
+        self.base_domain = base_domain
+        self.parser_backend = parser_backend
+        self.skip_binary_links = skip_binary_links
+        self.matcher = KeywordMatcher(keywords)
+        self.detectors = DetectorSet(detectors or [])
+
+    def analyze(self, html, url, follow_links=True):
+        """
+        Parse a page once and search it for keywords, detector matches and links.
+
+        Args:
+            html (str): HTML content
+            url (str): Page URL
+            follow_links (bool): Whether same-domain links should be returned
+
+        Returns:
+            tuple: (title, findings, links)
+        """
+        return self.analyze_timed(html, url, follow_links)[:3]
+
+    def analyze_timed(self, html, url, follow_links=True):
+        """
+        Same as `analyze()`, also measuring its stages.
+
+        Returns:
+            tuple: (title, findings, links, timings), timings holding the
+                `parse_seconds` and `match_seconds` of the page
+        """
+        started = time.perf_counter()
+        base_domain = self.base_domain or urlparse(url).netloc
+        page = parse_page(html, url, base_domain, self.parser_backend)
+        links = page.links if follow_links else []
+        if links and self.skip_binary_links:
+            links = [link for link in links if not is_binary_url(link)]
+        parsed = time.perf_counter()
+        findings = self.matcher.scan(page.text) if self.keywords else []
+        findings.extend(self.detectors.scan(page.text))
+        timings = {"parse_seconds": parsed - started, "match_seconds": time.perf_counter() - parsed}
+        return page.title, findings, links, timings
+
+
+# Analyzer of the current worker process, built once by the pool initializer
+_worker_analyzer = None
+
+
+def _init_worker(keywords, base_domain, parser_backend, skip_binary_links, detectors):
+    global _worker_analyzer
+    _worker_analyzer = PageAnalyzer(keywords, base_domain, parser_backend, skip_binary_links, detectors)
+
+
+def _analyze_in_worker(html, url, follow_links):
+    return _worker_analyzer.analyze_timed(html, url, follow_links)
+
+
+class AnalysisPool:
+    """
+    Run page analysis in a process pool so parsing never blocks the event loop.
+
+    At most `backlog` pages are submitted at once; callers wait for a free slot
+    before handing over more work, which in turn holds back the crawl workers
+    from fetching faster than pages can be analyzed.
+    """
+
+    def __init__(self, keywords, base_domain, parser_backend=None, workers=None, backlog=None,
+                 skip_binary_links=False, detectors=None):
+        """
+        Args:
+            keywords (list): Keywords to search
+            base_domain (str): Only links on this netloc are returned (None: the netloc of each page)
+            parser_backend (str): HTML parser backend
+            workers (int): Number of worker processes (default: CPU count)
+            backlog (int): Maximum pages queued or being analyzed (default: 2 per worker)
+            skip_binary_links (bool): Drop links to files with a binary extension
+            detectors (list): Detector objects run on each page
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(keywords, base_domain, parser_backend, skip_binary_links, detectors)
+        )
+        self.backlog = backlog or 2 * self.workers
+        self._slots = asyncio.Semaphore(self.backlog)
+
+    async def analyze(self, html, url, follow_links=True):
+        """
+        Analyze a page in a worker process.
+
+        Returns:
+            tuple: (title, findings, links, timings), as PageAnalyzer.analyze_timed
+        """
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _analyze_in_worker, html, url, follow_links)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
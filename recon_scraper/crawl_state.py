@@ -0,0 +1,118 @@
+import itertools
+import json
+import logging
+import sqlite3
+import time
+
+
+class CrawlStateStore:
+    """
+    SQLite-backed crawl state (frontier, visited URLs and progress) for resuming.
+
+    A URL stays in the `frontier` table until its page has been fully processed,
+    so pages that were in flight when a crawl died are fetched again on resume.
+    Updates are buffered and written in one transaction per batch, so the store
+    costs a few milliseconds per `batch_size` pages instead of one commit per URL.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, depth INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);
+    """
+
+    STATEMENTS = {
+        "enqueue": "INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)",
+        "visit": "INSERT OR IGNORE INTO visited (url) VALUES (?)",
+        "complete": "DELETE FROM frontier WHERE url = ?",
+    }
+
+    def __init__(self, path, batch_size=500, flush_interval=2.0):
+        """
+        Args:
+            path (str): SQLite database file
+            batch_size (int): Buffered updates that trigger a write
+            flush_interval (float): Seconds after which buffered updates are written
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def get_meta(self, key, default=None):
+        """Return a JSON value stored under `key` in the meta table."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        """Store a JSON-serializable value under `key` immediately."""
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def has_progress(self):
+        """Check whether a previous run left a frontier or visited URLs behind."""
+        return (self._conn.execute("SELECT 1 FROM frontier LIMIT 1").fetchone() is not None
+                or self._conn.execute("SELECT 1 FROM visited LIMIT 1").fetchone() is not None)
+
+    def load(self):
+        """
+        Load the state saved by a previous run.
+
+        Returns:
+            tuple: (visited set, list of (url, depth) still to crawl)
+        """
+        frontier = self._conn.execute("SELECT url, depth FROM frontier ORDER BY rowid").fetchall()
+        pending = {url for url, _ in frontier}
+        visited = {url for (url,) in self._conn.execute("SELECT url FROM visited")}
+        # URLs that were claimed but never completed are crawled again
+        return visited - pending, frontier
+
+    def enqueue(self, url, depth):
+        """Record a URL added to the frontier."""
+        self._pending.append(("enqueue", (url, depth)))
+
+    def mark_visited(self, url):
+        """Record a URL claimed by a crawl worker."""
+        self._pending.append(("visit", (url,)))
+
+    def complete(self, url):
+        """Record that a URL has been fully processed (or skipped)."""
+        self._pending.append(("complete", (url,)))
+
+    def needs_flush(self):
+        """Check whether enough updates are buffered, or enough time passed, to write them."""
+        return bool(self._pending) and (len(self._pending) >= self.batch_size
+                                        or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self, progress=None):
+        """
+        Write buffered updates in a single transaction.
+
+        Args:
+            progress (dict): Optional progress summary stored alongside the batch
+        """
+        pending, self._pending = self._pending, []
+        try:
+            with self._conn:
+                # Consecutive updates of the same kind go in one executemany, in order
+                for kind, group in itertools.groupby(pending, key=lambda op: op[0]):
+                    self._conn.executemany(self.STATEMENTS[kind], [params for _, params in group])
+                if progress is not None:
+                    self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                       ("progress", json.dumps(progress)))
+        except sqlite3.Error as e:
+            logging.error(f"Failed to save crawl state to {self.path}: {e}")
+            self._pending = pending + self._pending
+            return
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Write pending updates and close the database."""
+        if self._pending:
+            self.flush()
+        self._conn.close()
@@ -0,0 +1,199 @@
+import ipaddress
+import re
+
+
+# RFC 1918 ranges; `is_private` would also accept documentation and other reserved ranges
+_PRIVATE_NETWORKS = tuple(ipaddress.ip_network(network)
+                          for network in ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"))
+
+
+def _valid_private_ip(value):
+    """Keep RFC 1918 addresses, rejecting e.g. version numbers like 10.300.1.2 or 172.1.2.3."""
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return any(address in network for network in _PRIVATE_NETWORKS)
+
+
+def _valid_phone(value):
+    """Keep numbers with a plausible count of digits (E.164 allows at most 15)."""
+    digits = sum(char.isdigit() for char in value)
+    return 8 <= digits <= 15
+
+
+class Detector:
+    """
+    A named pattern class searched in page text, e.g. email addresses or API keys.
+
+    `anchors` are literal strings of which every match contains at least one
+    (e.g. "AKIA" for AWS access keys). Pages containing none of them are not
+    searched with the pattern at all, which is what keeps a long list of
+    detectors cheap. Detectors are plain data (pattern strings and module-level
+    validation functions), so they can be sent to parse worker processes.
+    """
+
+    def __init__(self, name, pattern, description="", anchors=(), ignore_case=False, validate=None,
+                 max_matches=100):
+        """
+        Args:
+            name (str): Name reported as the finding's keyword
+            pattern (str): Regular expression
+            description (str): What the detector finds
+            anchors (tuple): Literals found in every match (empty: the pattern runs on every page)
+            ignore_case (bool): Match the pattern (and anchors) case-insensitively
+            validate (callable): Function `(matched_text) -> bool` rejecting false positives
+            max_matches (int): Occurrences counted per page, after which the detector stops
+        """
+        self.name = name
+        self.pattern = pattern
+        self.description = description
+        self.anchors = tuple(anchor.lower() for anchor in anchors) if ignore_case else tuple(anchors)
+        self.ignore_case = ignore_case
+        self.validate = validate
+        self.max_matches = max_matches
+
+
+# Patterns start with a literal where possible, with word boundaries checked by a
+# lookbehind after it: the regex engine then jumps between occurrences of the
+# literal instead of trying the pattern at every position of the page.
+BUILTIN_DETECTORS = {detector.name: detector for detector in [
+    Detector("email", r"@(?<=[A-Za-z0-9._%+-]@)[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b",
+             "Email addresses", anchors=("@",)),
+    Detector("aws_access_key", r"A(?<![0-9A-Za-z]A)(?:KIA|SIA|BIA|CCA)[0-9A-Z]{16}(?![0-9A-Za-z])",
+             "AWS access key IDs", anchors=("AKIA", "ASIA", "ABIA", "ACCA")),
+    Detector("aws_secret_key", r"aws_?secret_?access_?key['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9/+=]{40}(?![A-Za-z0-9/+=])",
+             "AWS secret access keys assigned in code or configuration", anchors=("aws",), ignore_case=True),
+    Detector("gcp_api_key", r"AIza(?<![0-9A-Za-z_-]AIza)[0-9A-Za-z_-]{35}(?![0-9A-Za-z_-])",
+             "Google Cloud / Firebase API keys", anchors=("AIza",)),
+    Detector("gcp_service_account", r"\"type\"\s*:\s*\"service_account\"",
+             "Google Cloud service account key files", anchors=("service_account",)),
+    Detector("jwt", r"eyJ(?<![0-9A-Za-z_-]eyJ)[A-Za-z0-9_-]{8,}\.eyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}",
+             "JSON Web Tokens", anchors=("eyJ",)),
+    Detector("github_token", r"gh(?<![0-9A-Za-z]gh)[pousr]_[A-Za-z0-9]{36}(?![A-Za-z0-9])",
+             "GitHub access tokens", anchors=("ghp_", "gho_", "ghu_", "ghs_", "ghr_")),
+    Detector("slack_token", r"xox(?<![0-9A-Za-z]xox)[abprs]-[A-Za-z0-9-]{10,}",
+             "Slack tokens", anchors=("xox",)),
+    Detector("private_key", r"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP )?PRIVATE KEY(?: BLOCK)?-----",
+             "PEM private keys", anchors=("PRIVATE KEY",)),
+    Detector("internal_ip", r"1(?<![0-9.]1)(?:0|72|92)\.\d{1,3}\.\d{1,3}\.\d{1,3}(?![0-9])",
+             "Private (RFC 1918) IPv4 addresses", anchors=("10.", "172.", "192.168."), validate=_valid_private_ip),
+    Detector("phone", r"\+(?<![\w+]\+)\d{1,3}[ .-]?(?:\(\d{1,4}\)[ .-]?)?\d{1,4}(?:[ .-]?\d{2,4}){2,4}(?!\w)"
+                      r"|\((?<!\w\()\d{3}\)[ .-]?\d{3}[ .-]\d{4}(?!\w)",
+             "Phone numbers in international (+...) or (NNN) NNN-NNNN format", anchors=("+", "("),
+             validate=_valid_phone),
+]}
+
+
+def resolve_detectors(names):
+    """
+    Look up built-in detectors by name.
+
+    Args:
+        names (list): Detector names, or ["all"] for every built-in detector
+
+    Returns:
+        list: Detector objects
+
+    Raises:
+        ValueError: If a name is unknown
+    """
+    if not names:
+        return []
+    if "all" in names:
+        return list(BUILTIN_DETECTORS.values())
+    unknown = [name for name in names if name not in BUILTIN_DETECTORS]
+    if unknown:
+        raise ValueError(f"Unknown detector(s): {', '.join(unknown)} "
+                         f"(available: {', '.join(BUILTIN_DETECTORS)})")
+    return [BUILTIN_DETECTORS[name] for name in dict.fromkeys(names)]
+
+
+class DetectorSet:
+    """
+    The detectors of a scan, compiled once and run together on each page.
+
+    A page is first checked for the anchors of the detectors with substring
+    searches (each distinct anchor once); only the detectors whose anchors
+    occur are then run, each with its own compiled pattern. Most
+    detectors match nowhere on most pages, so the cost of a page grows with the
+    detectors that can match it rather than with the size of the registry.
+    (One alternation of all patterns would be a single regex pass, but with
+    CPython's engine it tries every alternative at every position and is
+    several times slower.) A detector stops after `max_matches` occurrences.
+    Findings use the keyword schema: the detector name is the `keyword`, with
+    occurrence count and context windows.
+    """
+
+    def __init__(self, detectors, context_size=30, max_contexts=5):
+        """
+        Args:
+            detectors (list): Detector objects
+            context_size (int): Characters before/after a match kept as context
+            max_contexts (int): Maximum contexts recorded per detector
+        """
+        self.detectors = list(detectors)
+        self.context_size = context_size
+        self.max_contexts = max_contexts
+        self._compiled = [
+            (detector, re.compile(detector.pattern, re.IGNORECASE if detector.ignore_case else 0))
+            for detector in self.detectors
+        ]
+
+    @property
+    def names(self):
+        """Names of the detectors, in order."""
+        return [detector.name for detector in self.detectors]
+
+    def scan(self, text):
+        """
+        Find every detector match in the text.
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: Findings ({"keyword", "occurrences", "contexts"}) in detector order
+        """
+        if not self._compiled or not text:
+            return []
+
+        findings = []
+        present = {}  # (anchor, ignore_case) -> whether it occurs in the page
+        lowered = None
+        context_size = self.context_size
+        text_length = len(text)
+        for detector, pattern in self._compiled:
+            if detector.anchors:
+                if detector.ignore_case:
+                    if lowered is None:
+                        lowered = text.lower()
+                    haystack = lowered
+                else:
+                    haystack = text
+                found = False
+                for anchor in detector.anchors:
+                    key = (anchor, detector.ignore_case)
+                    if key not in present:
+                        present[key] = anchor in haystack
+                    if present[key]:
+                        found = True
+                        break
+                if not found:
+                    continue
+
+            count = 0
+            contexts = []
+            for match in pattern.finditer(text):
+                if detector.validate is not None and not detector.validate(match.group()):
+                    continue
+                count += 1
+                if len(contexts) < self.max_contexts:
+                    start, end = match.span()
+                    context = text[max(0, start - context_size):min(text_length, end + context_size)]
+                    contexts.append(f"...{context.replace(chr(10), ' ').strip()}...")
+                if count >= detector.max_matches:
+                    break
+            if count:
+                findings.append({"keyword": detector.name, "occurrences": count, "contexts": contexts})
+        return findings
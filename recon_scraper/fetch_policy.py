@@ -0,0 +1,167 @@
+import asyncio
+import html
+import importlib.util
+import io
+import logging
+import posixpath
+from urllib.parse import urlparse
+
+# pypdf takes longer to import than the rest of the scraper; it is only loaded for the first PDF
+HAS_PYPDF = importlib.util.find_spec("pypdf") is not None
+
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 64 * 1024
+
+# Extensions of files that are never pages: links to them are dropped when
+# binary links are skipped, saving a request per link
+BINARY_EXTENSIONS = frozenset({
+    ".7z", ".apk", ".avi", ".bin", ".bmp", ".bz2", ".deb", ".dmg", ".eot", ".exe", ".flac", ".flv",
+    ".gif", ".gz", ".ico", ".img", ".iso", ".jar", ".jpeg", ".jpg", ".m4a", ".m4v", ".mkv", ".mov",
+    ".mp3", ".mp4", ".mpeg", ".msi", ".ogg", ".otf", ".png", ".rar", ".rpm", ".svg", ".tar", ".tgz",
+    ".tif", ".tiff", ".ttf", ".wav", ".webm", ".webp", ".wmv", ".woff", ".woff2", ".xz", ".zip",
+})
+
+
+def is_binary_url(url):
+    """
+    Check whether a URL obviously points to a binary file, judging by its extension.
+
+    Args:
+        url (str): Absolute URL
+
+    Returns:
+        bool: True if the path ends with a known binary extension
+    """
+    return posixpath.splitext(urlparse(url).path)[1].lower() in BINARY_EXTENSIONS
+
+
+def decode_text(body, charset):
+    """
+    Decode a response body, replacing invalid bytes.
+
+    Args:
+        body (bytes): Raw body
+        charset (str): Charset of the Content-Type header (None or unknown: UTF-8)
+
+    Returns:
+        str: Decoded text
+    """
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _as_html(text, title):
+    """Wrap extracted plain text in a minimal HTML page for the analyzer."""
+    return (f"<html><head><title>{html.escape(title)}</title></head>"
+            f"<body><pre>{html.escape(text)}</pre></body></html>")
+
+
+def extract_plain_text(body, charset, url):
+    """Extractor for text/plain documents."""
+    return _as_html(decode_text(body, charset), posixpath.basename(urlparse(url).path))
+
+
+def extract_pdf_text(body, charset, url):
+    """Extractor for PDF documents (requires pypdf)."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(body))
+    text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return _as_html(text, posixpath.basename(urlparse(url).path))
+
+
+def default_extractors():
+    """Return the extractors available with the installed packages, by content type."""
+    extractors = {"text/plain": extract_plain_text}
+    if HAS_PYPDF:
+        extractors["application/pdf"] = extract_pdf_text
+    return extractors
+
+
+class FetchPolicy:
+    """
+    Decides which responses are read and how much of them.
+
+    The Content-Type and Content-Length headers are checked before the body is
+    read. HTML is streamed in chunks up to `max_size` bytes; longer bodies are
+    truncated, and bodies announced as longer are not downloaded at all. Other
+    content types are skipped unless an extractor is registered for them. An
+    extractor is a function `(body, charset, url) -> str` returning HTML (or
+    text) for the analyzer; it runs in a thread so it does not stall the crawl.
+    """
+
+    def __init__(self, max_size=10 * 1024 * 1024, extractors=None):
+        """
+        Args:
+            max_size (int): Maximum body size read, in bytes
+            extractors (dict): Extractors by content type (default: `default_extractors()`)
+        """
+        self.max_size = max_size
+        self.extractors = default_extractors() if extractors is None else dict(extractors)
+
+        # Statistics for the current run
+        self.skipped_type = 0
+        self.skipped_size = 0
+        self.truncated = 0
+
+    def register_extractor(self, content_type, extractor):
+        """
+        Handle another content type.
+
+        Args:
+            content_type (str): MIME type, e.g. "application/json"
+            extractor (callable): Function `(body, charset, url) -> str`
+        """
+        self.extractors[content_type.lower()] = extractor
+
+    async def read(self, response, url):
+        """
+        Read a 200 response according to the policy.
+
+        Args:
+            response: aiohttp ClientResponse
+            url (str): Requested URL
+
+        Returns:
+            str: Content to analyze, or None if the response was skipped
+        """
+        # A response without Content-Type is assumed to be HTML, as before
+        content_type = response.content_type if "Content-Type" in response.headers else "text/html"
+        extractor = None
+        if content_type not in HTML_TYPES:
+            extractor = self.extractors.get(content_type)
+            if extractor is None:
+                self.skipped_type += 1
+                logging.info(f"Skipped {url}: unsupported content type {content_type}")
+                return None
+
+        if response.content_length is not None and response.content_length > self.max_size:
+            self.skipped_size += 1
+            logging.info(f"Skipped {url}: {response.content_length} bytes exceeds the {self.max_size} bytes limit")
+            return None
+
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            body += chunk
+            if len(body) >= self.max_size:
+                if len(body) > self.max_size or not response.content.at_eof():
+                    self.truncated += 1
+                    logging.warning(f"Truncated {url} to {self.max_size} bytes")
+                del body[self.max_size:]
+                break
+        body = bytes(body)
+
+        if extractor is None:
+            return decode_text(body, response.charset)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, extractor, body, response.charset, url)
+        except Exception as e:
+            logging.error(f"Failed to extract text from {url} ({content_type}): {e}")
+            return None
+
+    def summary(self):
+        """Return a one-line description of skipped and truncated responses."""
+        return (f"{self.skipped_type} skipped by content type, {self.skipped_size} skipped by size, "
+                f"{self.truncated} truncated")
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+
+def content_hash(html):
+    """
+    Fingerprint a page body.
+
+    Args:
+        html (str): Page content
+
+    Returns:
+        str: Hex digest of the content
+    """
+    return hashlib.blake2b(html.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+
+def diff_findings(previous, current):
+    """
+    Compare the findings of a page between two scans.
+
+    Args:
+        previous (list): Findings of the previous scan
+        current (list): Findings of this scan
+
+    Returns:
+        list: Changes as dicts with `keyword`, `change` ("new", "removed" or
+            "changed"), `occurrences` and `previous_occurrences`
+    """
+    before = {finding["keyword"]: finding["occurrences"] for finding in previous}
+    after = {finding["keyword"]: finding["occurrences"] for finding in current}
+    changes = []
+    for keyword, occurrences in after.items():
+        if keyword not in before:
+            changes.append({"keyword": keyword, "change": "new",
+                            "occurrences": occurrences, "previous_occurrences": 0})
+        elif before[keyword] != occurrences:
+            changes.append({"keyword": keyword, "change": "changed",
+                            "occurrences": occurrences, "previous_occurrences": before[keyword]})
+    for keyword, occurrences in before.items():
+        if keyword not in after:
+            changes.append({"keyword": keyword, "change": "removed",
+                            "occurrences": 0, "previous_occurrences": occurrences})
+    return changes
+
+
+class FingerprintIndex:
+    """
+    Content hash, title, findings and links of every page seen by previous scans.
+
+    A page whose content hash matches the stored one does not need to be parsed
+    or matched again: its stored analysis is reused. Stored analyses are only
+    valid for the settings they were produced with (keywords, detectors, parser),
+    recorded with each entry as its `analysis_key`; a scan with other settings
+    analyzes the page again and overwrites the entry. Entries it does not reach
+    keep their old key, so they are not reused by later scans either. Writes are
+    batched like the crawl state.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            hash TEXT NOT NULL,
+            title TEXT,
+            findings TEXT NOT NULL,
+            links TEXT,
+            scanned_at REAL NOT NULL,
+            analysis_key TEXT
+        );
+    """
+
+    def __init__(self, path, analysis_key, batch_size=200):
+        """
+        Args:
+            path (str): SQLite database file
+            analysis_key (str): Identifies the settings findings depend on
+            batch_size (int): Buffered entries that trigger a write
+        """
+        self.path = path
+        self.analysis_key = analysis_key
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        columns = {name for _, name, *_ in self._conn.execute("PRAGMA table_info(pages)")}
+        if "analysis_key" not in columns:
+            # Index from before keys were stored per entry: its entries are never reused
+            with self._conn:
+                self._conn.execute("ALTER TABLE pages ADD COLUMN analysis_key TEXT")
+        self._pending = []
+
+        # Statistics for the current run
+        self.reused = 0
+        self.analyzed = 0
+
+    def get(self, url):
+        """
+        Find the entry stored for a URL by a previous scan.
+
+        Args:
+            url (str): Canonical URL
+
+        Returns:
+            dict: `hash`, `title`, `findings`, `links` (None if links were not
+                extracted) and `analysis_key`, or None if the URL is not in the index
+        """
+        row = self._conn.execute("SELECT hash, title, findings, links, analysis_key FROM pages WHERE url = ?",
+                                 (url,)).fetchone()
+        if row is None:
+            return None
+        digest, title, findings, links, analysis_key = row
+        return {
+            "hash": digest,
+            "title": title,
+            "findings": json.loads(findings),
+            "links": json.loads(links) if links is not None else None,
+            "analysis_key": analysis_key
+        }
+
+    def same_settings(self, entry):
+        """Check whether a stored entry was analyzed with the current settings, so its findings compare."""
+        return entry is not None and entry["analysis_key"] == self.analysis_key
+
+    def reusable_entry(self, entry, digest, need_links):
+        """
+        Check whether a stored entry can stand in for analyzing the page again.
+
+        Args:
+            entry (dict): Entry returned by `get()` (or None)
+            digest (str): Content hash of the page just fetched
+            need_links (bool): Whether the page's links are needed
+
+        Returns:
+            bool: True if the stored title, findings and links are still valid
+        """
+        return (self.same_settings(entry) and entry["hash"] == digest
+                and (entry["links"] is not None or not need_links))
+
+    def record(self, url, digest, title, findings, links):
+        """
+        Store the analysis of a page.
+
+        Args:
+            url (str): Canonical URL
+            digest (str): Content hash
+            title (str): Page title
+            findings (list): Findings
+            links (list): Links of the page (None if they were not extracted)
+        """
+        self._pending.append((url, digest, title, json.dumps(findings),
+                              json.dumps(links) if links is not None else None, time.time(), self.analysis_key))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered entries in a single transaction."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages (url, hash, title, findings, links, scanned_at, analysis_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", pending
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update fingerprint index {self.path}: {e}")
+            self._pending = pending + self._pending
+
+    def close(self):
+        """Write pending entries and close the database."""
+        self.flush()
+        self._conn.close()
+
+
+class ChangeLog:
+    """NDJSON file listing findings that appeared, disappeared or changed since the last scan."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): NDJSON file to append changes to (created on the first change)
+        """
+        self.path = path
+        self.counts = {"new": 0, "removed": 0, "changed": 0}
+        self._file = None
+
+    def write(self, url, title, changes):
+        """
+        Append the changes of a page.
+
+        Args:
+            url (str): Page URL
+            title (str): Page title
+            changes (list): Changes returned by `diff_findings()`
+        """
+        if not changes:
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        for change in changes:
+            self.counts[change["change"]] += 1
+            self._file.write(json.dumps(dict(change, url=url, title=title), ensure_ascii=False) + "\n")
+
+    @property
+    def total(self):
+        """Number of changes written."""
+        return sum(self.counts.values())
+
+    def close(self):
+        """Close the change file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
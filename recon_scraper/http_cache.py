@@ -0,0 +1,166 @@
+import logging
+import os
+import sqlite3
+import time
+import zlib
+
+
+class CachedResponse:
+    """A cached page body with its validators."""
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, body, etag, last_modified):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self):
+        """Return the If-None-Match / If-Modified-Since headers to revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk cache of page bodies, revalidated with conditional requests.
+
+    Only responses carrying an ETag or Last-Modified header are stored, since
+    they are the only ones a server can answer with 304 Not Modified. Bodies are
+    zlib-compressed in a SQLite database; when the total size exceeds `max_bytes`,
+    the least recently used entries are evicted.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+    """
+
+    def __init__(self, cache_dir, max_bytes=500 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache database
+            max_bytes (int): Maximum total size of stored (compressed) bodies
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "http_cache.db")
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        # Statistics for the current run
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def lookup(self, url):
+        """
+        Find the cached entry for a URL.
+
+        Args:
+            url (str): Canonical URL
+
+        Returns:
+            CachedResponse: Cached entry, or None
+        """
+        row = self._conn.execute("SELECT etag, last_modified, body FROM entries WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body = row
+        try:
+            return CachedResponse(zlib.decompress(body).decode("utf-8"), etag, last_modified)
+        except (zlib.error, UnicodeDecodeError) as e:
+            logging.warning(f"Dropping corrupt cache entry for {url}: {e}")
+            self._delete(url)
+            return None
+
+    def record_hit(self, url, entry):
+        """Count a 304 response answered from the cache and refresh the entry's LRU position."""
+        self.hits += 1
+        self.bytes_saved += len(entry.body)
+        with self._conn:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def record_miss(self):
+        """Count a request that had to download the full body."""
+        self.misses += 1
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """
+        Store a page body if the response can be revalidated later.
+
+        Args:
+            url (str): Canonical URL
+            body (str): Page content
+            etag (str): ETag response header
+            last_modified (str): Last-Modified response header
+        """
+        if not etag and not last_modified:
+            return
+        data = zlib.compress(body.encode("utf-8"), 6)
+        with self._conn:
+            previous = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, last_modified, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, data, len(data), time.time())
+            )
+        self._total_bytes += len(data) - (previous[0] if previous else 0)
+        self.stores += 1
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _delete(self, url):
+        with self._conn:
+            row = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._total_bytes -= row[0]
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is back under 90% of its limit."""
+        target = self.max_bytes * 0.9
+        with self._conn:
+            while self._total_bytes > target:
+                rows = self._conn.execute(
+                    "SELECT url, size FROM entries ORDER BY last_access LIMIT 100"
+                ).fetchall()
+                if not rows:
+                    self._total_bytes = 0
+                    break
+                evicted = []
+                for url, size in rows:
+                    if self._total_bytes <= target:
+                        break
+                    evicted.append((url,))
+                    self._total_bytes -= size
+                self._conn.executemany("DELETE FROM entries WHERE url = ?", evicted)
+                self.evictions += len(evicted)
+
+    def summary(self):
+        """Return a one-line description of this run's cache statistics."""
+        requests = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / requests if requests else 0.0
+        return (f"{self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                f"{self.bytes_saved / 1024:.1f} KB not downloaded, {self.stores} stored, "
+                f"{self.evictions} evicted, {self._total_bytes / (1024 * 1024):.1f} MB on disk")
+
+    def close(self):
+        """Close the cache database."""
+        self._conn.close()
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+
+from metrics import CrawlMetrics
+from recon_scraper import ReconScraper
+from results_store import ResultsStore
+
+
+class ScanJob:
+    """
+    A scan submitted through the web interface.
+
+    Its state is updated from the background event loop and read from Flask
+    request threads, so every access goes through a condition variable; waiters
+    are woken whenever the state changes.
+    """
+
+    FINISHED = ("completed", "failed")
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.progress = {"pages": 0, "findings": 0, "queued": 0, "rate": 0.0}
+        self.result = None
+        self._version = 0
+        self._changed = threading.Condition()
+
+    def update(self, **fields):
+        """Update job fields and wake up anyone waiting for changes."""
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._version += 1
+            self._changed.notify_all()
+
+    def to_dict(self, include_result=True):
+        """Return a JSON-serializable view of the job."""
+        with self._changed:
+            data = {
+                "job_id": self.id,
+                "status": self.status,
+                "url": self.params.get("target_url"),
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "error": self.error,
+                "progress": dict(self.progress),
+            }
+            if include_result and self.result is not None:
+                data["result"] = self.result
+            return data
+
+    def wait_for_change(self, version, timeout):
+        """
+        Block until the job state is newer than `version`.
+
+        Args:
+            version (int): Last version seen by the caller
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            tuple: (job dict without result, or None on timeout; current version)
+        """
+        with self._changed:
+            if self._version == version:
+                self._changed.wait(timeout)
+            if self._version == version:
+                return None, version
+            return self.to_dict(include_result=False), self._version
+
+
+class JobManager:
+    """
+    Run scans on a background event loop so HTTP requests return immediately.
+
+    All jobs share one event loop in a daemon thread; at most
+    `max_concurrent_jobs` crawls run at once, and the others wait in line.
+    """
+
+    # Maximum results returned inline with a finished job; files hold the rest
+    RESULTS_PREVIEW_LIMIT = 1000
+
+    def __init__(self, output_dir, max_concurrent_jobs=4, progress_interval=0.5):
+        """
+        Args:
+            output_dir (str): Directory to save results
+            max_concurrent_jobs (int): Maximum crawls running at the same time
+            progress_interval (float): Minimum seconds between two progress updates of a job
+        """
+        self.output_dir = output_dir
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.progress_interval = progress_interval
+        # Totals of every scan, so /metrics covers the whole server; each scan
+        # also has its own metrics, written next to its results
+        self.metrics = CrawlMetrics()
+        # Findings of every scan, indexed for the results page and API; result
+        # files written before the store existed are indexed in the background
+        self.store = ResultsStore(os.path.join(output_dir, "results.db"))
+        threading.Thread(target=self.store.import_directory, args=(output_dir,),
+                         name="results-import", daemon=True).start()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._slots = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="scan-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, params):
+        """
+        Queue a scan.
+
+        Args:
+            params (dict): ReconScraper keyword arguments (target_url, keywords, ...)
+
+        Returns:
+            ScanJob: The new job
+        """
+        job = ScanJob(uuid.uuid4().hex, params)
+        with self._lock:
+            self._jobs[job.id] = job
+        asyncio.run_coroutine_threadsafe(self._run(job), self._loop)
+        logging.info(f"Queued scan job {job.id} for {params.get('target_url')}")
+        return job
+
+    def get(self, job_id):
+        """Return the job with this ID, or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        """Return all jobs, newest first."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def prometheus(self):
+        """Render the crawl metrics and the number of jobs per status in the Prometheus text format."""
+        counts = {status: 0 for status in ("queued", "running") + ScanJob.FINISHED}
+        for job in self.list():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        for status, count in counts.items():
+            self.metrics.set_gauge("jobs", count, status=status)
+        return self.metrics.prometheus()
+
+    async def _run(self, job):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent_jobs)
+
+        async with self._slots:
+            job.update(status="running", started=time.time())
+            logging.info(f"Starting scan job {job.id}")
+            try:
+                loop = asyncio.get_running_loop()
+                # The constructor does blocking setup (files, databases), keep it off the loop
+                scraper = await loop.run_in_executor(None, lambda: ReconScraper(
+                    output_dir=self.output_dir, show_progress=False, quiet=True,
+                    metrics=CrawlMetrics(self.metrics, job=job.id),
+                    results_store=self.store, scan_id=job.id, **job.params
+                ))
+                scraper.on_progress = self._progress_reporter(job)
+                await scraper.crawl()
+                scraper.save_results()
+                job.update(
+                    status="completed",
+                    finished=time.time(),
+                    progress=scraper.progress_snapshot(),
+                    result=self._build_result(scraper)
+                )
+                logging.info(f"Scan job {job.id} completed")
+            except Exception as e:
+                logging.error(f"Scan job {job.id} failed: {e}", exc_info=True)
+                job.update(status="failed", finished=time.time(), error=str(e))
+            finally:
+                self.metrics.remove_gauges(job=job.id)
+
+    def _progress_reporter(self, job):
+        """Build a progress callback that updates the job at most every `progress_interval` seconds."""
+        last_update = [0.0]
+
+        def report(progress):
+            now = time.monotonic()
+            if now - last_update[0] >= self.progress_interval:
+                last_update[0] = now
+                job.update(progress=progress)
+
+        return report
+
+    def _build_result(self, scraper):
+        json_path = scraper.sink.ndjson_path
+        csv_path = scraper.sink.csv_path
+        results = self.store.page_results(scraper.scan_id, limit=self.RESULTS_PREVIEW_LIMIT)
+        return {
+            "message": f"Scraping completed with {scraper.sink.pages} results",
+            "visitedUrls": len(scraper.visited_urls),
+            "resultsCount": scraper.sink.pages,
+            "results": results,
+            "files": {
+                "json": os.path.basename(json_path) if os.path.exists(json_path) else "",
+                "csv": os.path.basename(csv_path) if os.path.exists(csv_path) else ""
+            }
+        }
@@ -0,0 +1,133 @@
+import re
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True  # End-of-word marker
+    return trie
+
+
+def _trie_to_regex(node):
+    """
+    Turn a character trie into a regex that needs no backtracking across keywords.
+
+    A flat alternation `a|b|c...` makes the regex engine try every keyword at every
+    position, so the cost grows with the size of the watchlist. The trie form shares
+    common prefixes (`api(?:_key|_secret)?`) and only follows branches that can match.
+    Optional groups are greedy, so the longest keyword at a position wins.
+    """
+    is_end = "" in node
+    branches = [re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if is_end else pattern
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive multi-keyword matcher, compiled once and run in a single pass.
+
+    Produces the same findings as searching each keyword separately: occurrences
+    are counted per keyword without overlap (like `re.findall`), and up to
+    `max_contexts` context windows are kept per keyword.
+    """
+
+    def __init__(self, keywords, context_size=30, max_contexts=5):
+        """
+        Args:
+            keywords (list): Keywords to search
+            context_size (int): Characters before/after a match kept as context
+            max_contexts (int): Maximum contexts recorded per keyword
+        """
+        self.keywords = [keyword for keyword in keywords if keyword]
+        self.context_size = context_size
+        self.max_contexts = max_contexts
+
+        # Keywords differing only by case share one lowercase form
+        self._forms = {}
+        for keyword in self.keywords:
+            self._forms.setdefault(keyword.lower(), []).append(keyword)
+
+        # The regex reports the longest keyword at each position; every shorter
+        # keyword matching at the same position is a prefix of it.
+        self._prefixes = {
+            form: [form[:i] for i in range(1, len(form) + 1) if form[:i] in self._forms]
+            for form in self._forms
+        }
+
+        self._pattern = None
+        self._overlapping = False
+        if self._forms:
+            trie = _build_trie(self._forms)
+            self._pattern = re.compile(_trie_to_regex(trie), re.IGNORECASE)
+            # When a keyword can begin inside another keyword's match, the next
+            # search resumes one character after the match start, not at its end.
+            self._overlapping = self._can_overlap(trie)
+
+    def _can_overlap(self, trie):
+        """Check whether a keyword can start inside a match of another keyword."""
+        for form in self._forms:
+            for offset in range(1, len(form)):
+                node = trie
+                for char in form[offset:]:
+                    node = node.get(char)
+                    if node is None or "" in node:
+                        break
+                if node is not None:
+                    return True
+        return False
+
+    def scan(self, text):
+        """
+        Find every keyword in the text.
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: Findings ({"keyword", "occurrences", "contexts"}) in keyword order
+        """
+        if self._pattern is None or not text:
+            return []
+
+        counts = {}
+        contexts = {}
+        last_end = {}
+        context_size = self.context_size
+        text_length = len(text)
+
+        search = self._pattern.search
+        overlapping = self._overlapping
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            prefixes = self._prefixes.get(match.group().lower(), ())
+            match = search(text, start + 1 if overlapping else match.end())
+            for form in prefixes:
+                if start < last_end.get(form, 0):
+                    continue  # Overlaps the previous occurrence of this keyword
+                end = start + len(form)
+                last_end[form] = end
+                counts[form] = counts.get(form, 0) + 1
+                form_contexts = contexts.setdefault(form, [])
+                if len(form_contexts) < self.max_contexts:
+                    context = text[max(0, start - context_size):min(text_length, end + context_size)]
+                    form_contexts.append(f"...{context.replace(chr(10), ' ').strip()}...")
+
+        findings = []
+        for keyword in self.keywords:
+            form = keyword.lower()
+            if form in counts:
+                findings.append({
+                    "keyword": keyword,
+                    "occurrences": counts[form],
+                    "contexts": list(contexts[form])
+                })
+        return findings
@@ -0,0 +1,249 @@
+import time
+from contextlib import contextmanager
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "dns_seconds": "DNS resolution time",
+    "connect_seconds": "Time to open a new connection (including TLS)",
+    "ttfb_seconds": "Time from sending a request to receiving the response headers",
+    "download_seconds": "Time to read a response body",
+    "fetch_seconds": "Total time of a page fetch, retries included",
+    "parse_seconds": "HTML parsing time per page",
+    "match_seconds": "Keyword matching time per page",
+    "analysis_seconds": "Page analysis time, including the wait for a parse worker",
+    "pages_total": "Pages fetched",
+    "requests_total": "HTTP requests sent",
+    "responses_total": "HTTP responses by status code",
+    "retries_total": "Requests retried after a failure, by reason",
+    "circuit_open_total": "Times a failing host was paused",
+    "hosts_abandoned_total": "Hosts skipped after failing repeatedly",
+    "errors_total": "Requests that failed",
+    "queue_depth": "URLs waiting in the crawl queue",
+    "jobs": "Scan jobs by status",
+}
+
+
+class Histogram:
+    """Latency distribution over fixed buckets, as in Prometheus."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """Record one measurement."""
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        """Return count, sum, mean, estimated percentiles and max."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class CrawlMetrics:
+    """
+    Counters, gauges and latency histograms of a crawl.
+
+    Updates are plain dictionary operations on the event loop thread. Readers on
+    other threads (the web interface's /metrics) work on copies, which are taken
+    atomically under the GIL.
+
+    The metrics of one crawl can feed a `parent` set covering several crawls,
+    such as the web server's: counters and histograms add up there, while
+    gauges, which hold the current value of one crawl, get the crawl's `labels`
+    so concurrent crawls do not overwrite each other.
+    """
+
+    def __init__(self, parent=None, **labels):
+        """
+        Args:
+            parent (CrawlMetrics): Metrics every update is also applied to
+            **labels: Labels identifying this crawl's gauges in `parent`, e.g. job="..."
+        """
+        self.parent = parent
+        self.labels = labels
+        self._counters = {}    # (name, labels) -> value
+        self._gauges = {}      # (name, labels) -> value
+        self._histograms = {}  # name -> Histogram
+        self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        """Increase a counter."""
+        key = (name, _label_key(labels))
+        self._counters[key] = self._counters.get(key, 0) + value
+        if self.parent is not None:
+            self.parent.inc(name, value, **labels)
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to its current value."""
+        self._gauges[(name, _label_key(labels))] = value
+        if self.parent is not None:
+            self.parent.set_gauge(name, value, **labels, **self.labels)
+
+    def remove_gauges(self, **labels):
+        """Drop the gauges carrying these labels, e.g. those of a finished crawl."""
+        wanted = set(labels.items())
+        for key in [key for key in self._gauges if wanted <= set(key[1])]:
+            del self._gauges[key]
+
+    def observe(self, name, seconds):
+        """Record a duration in a histogram."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram()
+        histogram.observe(seconds)
+        if self.parent is not None:
+            self.parent.observe(name, seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Measure the duration of a block into a histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def trace_config(self):
+        """Build an aiohttp TraceConfig timing DNS, connection setup and time to first byte."""
+        import aiohttp
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace.on_connection_create_start.append(self._on_connect_start)
+        trace.on_connection_create_end.append(self._on_connect_end)
+        return trace
+
+    async def _on_request_start(self, session, context, params):
+        context.request_start = time.perf_counter()
+        self.inc("requests_total")
+
+    async def _on_request_end(self, session, context, params):
+        # Fired once the response headers are in, before the body is read
+        self.observe("ttfb_seconds", time.perf_counter() - context.request_start)
+        self.inc("responses_total", status=params.response.status)
+
+    async def _on_request_exception(self, session, context, params):
+        self.inc("errors_total", error=type(params.exception).__name__)
+
+    async def _on_dns_start(self, session, context, params):
+        context.dns_start = time.perf_counter()
+
+    async def _on_dns_end(self, session, context, params):
+        self.observe("dns_seconds", time.perf_counter() - context.dns_start)
+
+    async def _on_connect_start(self, session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def _on_connect_end(self, session, context, params):
+        self.observe("connect_seconds", time.perf_counter() - context.connect_start)
+
+    def to_dict(self):
+        """Return every metric as a JSON-serializable dict."""
+        counters = {}
+        for (name, labels), value in dict(self._counters).items():
+            if labels:
+                counters.setdefault(name, {})[",".join(f"{k}={v}" for k, v in labels)] = value
+            else:
+                counters[name] = value
+        gauges = {}
+        for (name, labels), value in dict(self._gauges).items():
+            if labels:
+                gauges.setdefault(name, {})[",".join(f"{k}={v}" for k, v in labels)] = value
+            else:
+                gauges[name] = value
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": {name: histogram.to_dict() for name, histogram in dict(self._histograms).items()},
+        }
+
+    def prometheus(self, prefix="recon_"):
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix added to metric names
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {prefix}{name} {HELP[name]}")
+                lines.append(f"# TYPE {prefix}{name} {kind}")
+
+        for (name, labels), value in sorted(dict(self._counters).items(), key=lambda item: str(item[0])):
+            describe(name, "counter")
+            lines.append(f"{prefix}{name}{_format_labels(labels)} {value}")
+        for (name, labels), value in sorted(dict(self._gauges).items(), key=lambda item: str(item[0])):
+            describe(name, "gauge")
+            lines.append(f"{prefix}{name}{_format_labels(labels)} {value}")
+        for name, histogram in sorted(dict(self._histograms).items()):
+            describe(name, "histogram")
+            counts = list(histogram.counts)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, counts):
+                cumulative += count
+                lines.append(f'{prefix}{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}{name}_bucket{{le="+Inf"}} {sum(counts)}')
+            lines.append(f"{prefix}{name}_sum {histogram.sum}")
+            lines.append(f"{prefix}{name}_count {sum(counts)}")
+        return "\n".join(lines) + "\n"
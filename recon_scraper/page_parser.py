@@ -0,0 +1,122 @@
+from urllib.parse import urljoin, urlparse
+
+from url_utils import canonicalize_url
+
+# Optional fast HTML backends, preferred in this order when installed
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        # selectolax < 0.3.13 only ships the Modest engine
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+AVAILABLE_BACKENDS = [
+    name for name, module in (("selectolax", SelectolaxParser), ("lxml", lxml_html)) if module is not None
+] + ["html.parser"]
+
+DEFAULT_BACKEND = AVAILABLE_BACKENDS[0]
+
+# Elements whose content BeautifulSoup leaves out of get_text()
+NON_TEXT_TAGS = ["script", "style", "template"]
+
+
+class ParsedPage:
+    """Text, title and links extracted from a single parse of an HTML page."""
+
+    __slots__ = ("text", "title", "links")
+
+    def __init__(self, text, title, links):
+        self.text = text
+        self.title = title
+        self.links = links
+
+
+def _parse_selectolax(html):
+    tree = SelectolaxParser(html)
+    title_node = tree.css_first("title")
+    title = title_node.text() if title_node is not None else None
+    hrefs = [node.attributes.get("href") for node in tree.css("a[href]")]
+    tree.strip_tags(NON_TEXT_TAGS)
+    root = tree.root
+    text = root.text(deep=True, separator="") if root is not None else ""
+    return text, title, hrefs
+
+
+def _parse_lxml(html):
+    try:
+        root = lxml_html.document_fromstring(html)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration must be passed as bytes
+        root = lxml_html.document_fromstring(html.encode("utf-8"))
+    except Exception:
+        # lxml rejects documents with no elements at all
+        return "", None, []
+    title_node = root.find(".//title")
+    title = title_node.text_content() if title_node is not None else None
+    hrefs = [a.get("href") for a in root.iter("a") if a.get("href") is not None]
+    for element in list(root.iter(*NON_TEXT_TAGS)):
+        element.drop_tree()
+    return root.text_content(), title, hrefs
+
+
+def _parse_html_parser(html):
+    # BeautifulSoup is slow to import and only needed by this fallback backend
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title")
+    title = title_tag.text if title_tag else None
+    hrefs = [a_tag["href"] for a_tag in soup.find_all("a", href=True)]
+    return soup.get_text(), title, hrefs
+
+
+_BACKENDS = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "html.parser": _parse_html_parser,
+}
+
+
+def parse_page(html, page_url, base_domain=None, backend=None):
+    """
+    Parse an HTML page once and extract its text, title and links.
+
+    Args:
+        html (str): HTML content
+        page_url (str): URL of the page, used to resolve relative links
+        base_domain (str): Only keep links on this netloc (None keeps all)
+        backend (str): Parser backend name (defaults to the fastest installed)
+
+    Returns:
+        ParsedPage: Extracted text, title ("No title" if missing) and unique canonical links
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in AVAILABLE_BACKENDS:
+        raise ValueError(f"Parser backend '{backend}' is not available (installed: {', '.join(AVAILABLE_BACKENDS)})")
+
+    text, title, hrefs = _BACKENDS[backend](html)
+
+    links = []
+    seen = set()
+    for href in hrefs:
+        if href is None:
+            continue
+        try:
+            full_url = canonicalize_url(urljoin(page_url, href))
+            netloc = urlparse(full_url).netloc
+        except ValueError:
+            continue  # Malformed href, e.g. an invalid IPv6 literal
+        if full_url in seen:
+            continue
+        seen.add(full_url)
+        if base_domain is None or netloc == base_domain:
+            links.append(full_url)
+
+    return ParsedPage(text, title if title is not None else "No title", links)
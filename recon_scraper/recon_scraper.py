@@ -1,21 +1,29 @@
 import argparse
 import asyncio
-import csv
 import json
 import logging
 import os
-import random
 import re
 import time
-from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
+from urllib.parse import urlparse
 
-import aiohttp
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-from rich.console import Console
-from rich.progress import Progress
-from rich.table import Table
+from analyzer import AnalysisPool, PageAnalyzer
+from crawl_state import CrawlStateStore
+from detectors import BUILTIN_DETECTORS, resolve_detectors
+from fetch_policy import FetchPolicy
+from fingerprints import ChangeLog, FingerprintIndex, content_hash, diff_findings
+from http_cache import HttpCache
+from metrics import CrawlMetrics
+from page_parser import AVAILABLE_BACKENDS, DEFAULT_BACKEND
+from result_sink import StreamingResultSink
+from results_store import ResultsStore
+from retry import CircuitBreaker, RetryPolicy
+from robots import RobotsCache
+from sitemaps import collect_sitemap_urls
+from scheduler import HostScheduler
+from transport import ConnectionStats, TransportConfig, create_session
+from targets import CrawlTarget, load_targets
+from user_agents import random_user_agent
 
 # Configure logging
 logging.basicConfig(
@@ -31,62 +39,206 @@ class ReconScraper:
     Respects privacy and site restrictions.
     """
     
-    def __init__(self, target_url, keywords=None, depth=1, output_dir="results", max_urls=100, ignore_robots=False):
+    def __init__(self, target_url=None, keywords=None, depth=1, output_dir="results", max_urls=100, ignore_robots=False,
+                 concurrency=5, delay=0.5, parser_backend=None, parse_workers=0, parse_backlog=None,
+                 state_file=None, cache_dir=None, cache_size=500 * 1024 * 1024, transport=None,
+                 show_progress=True, on_progress=None, targets=None, robots_ttl=86400, use_sitemaps=False,
+                 incremental_index=None, max_page_size=10 * 1024 * 1024, extractors=None, skip_binary_links=False,
+                 quiet=False, metrics=None, retry_policy=None, circuit_breaker=None, results_store=None,
+                 scan_id=None, detectors=None):
         """
         Initialize the scraper with basic parameters.
         
         Args:
-            target_url (str): Target URL to scrape
+            target_url (str): Target URL to scrape (unless `targets` is given)
             keywords (list): List of keywords to search
-            depth (int): Crawling depth
+            depth (int): Crawling depth (of `target_url`)
             output_dir (str): Directory to save results
-            max_urls (int): Maximum number of URLs to crawl
+            max_urls (int): Maximum number of URLs to crawl (on `target_url`)
             ignore_robots (bool): Ignore robots.txt for testing
+            concurrency (int): Number of concurrent crawl workers (max in-flight requests)
+            delay (float): Base interval between two requests to the same host
+            parser_backend (str): HTML parser backend (default: fastest installed)
+            parse_workers (int): Processes used for parsing/matching (0 runs them inline)
+            parse_backlog (int): Maximum pages waiting for a parse worker (default: 2 per worker)
+            state_file (str): SQLite file recording crawl progress so the crawl can be resumed
+            cache_dir (str): Directory of the HTTP response cache (None disables caching)
+            cache_size (int): Maximum size of the HTTP cache in bytes
+            transport (TransportConfig): Connection pool, DNS cache and timeout settings
+            show_progress (bool): Display the live progress bar on the console
+            on_progress (callable): Called with `progress_snapshot()` after each crawled page
+            targets (list): CrawlTarget objects (or their `to_dict()` form) to crawl together
+                in one batch, each with its own budget and depth
+            robots_ttl (float): Seconds a fetched robots.txt is reused (kept in `cache_dir` across runs)
+            use_sitemaps (bool): Seed the crawl with the URLs listed in the targets' sitemaps
+            incremental_index (str): SQLite file of page fingerprints; unchanged pages reuse the
+                analysis of the previous scan and changed findings are written to a changes file
+            max_page_size (int): Maximum response body read, in bytes
+            extractors (dict): Text extractors for non-HTML content types (default: those available;
+                an empty dict skips every non-HTML response)
+            skip_binary_links (bool): Do not queue links to files with a binary extension
+            quiet (bool): Do not print per-URL messages on the console
+            metrics (CrawlMetrics): Metrics to update (default: a new set for this crawl)
+            retry_policy (RetryPolicy): Retry budgets and backoff of failed requests
+            circuit_breaker (CircuitBreaker): Pauses, then drops, hosts whose requests keep failing
+            results_store (ResultsStore): Store indexing the scan and its findings for queries
+            scan_id (str): Identifier of the scan in `results_store`, also added to the result file
+                names (default: the result file name)
+            detectors (list): Names of built-in secret/PII detectors to run on each page, or ["all"];
+                their matches are reported as findings named after the detector
         """
+        if targets is None:
+            if not target_url:
+                raise ValueError("A target URL or a list of targets is required")
+            targets = [CrawlTarget(target_url, max_urls, depth)]
+        
         self.target_url = target_url
         self.keywords = keywords or []
+        self.detectors = resolve_detectors(detectors)
+        self.detector_names = [detector.name for detector in self.detectors]
         self.depth = depth
         self.output_dir = output_dir
         self.max_urls = max_urls
         self.ignore_robots = ignore_robots
+        self.concurrency = max(1, concurrency)
+        self.delay = delay
+        self.parser_backend = parser_backend or DEFAULT_BACKEND
+        self.parse_workers = parse_workers
+        self.parse_backlog = parse_backlog
+        self.use_sitemaps = use_sitemaps
+        self.analysis_pool = None
+        self.scheduler = None
+        self.cache = HttpCache(cache_dir, cache_size) if cache_dir else None
+        self.transport = transport or TransportConfig()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.connection_stats = ConnectionStats()
         self.visited_urls = set()
-        self.results = []
-        self.console = Console()
+        self.retries = 0
+        self.elapsed = 0.0
+        self.show_progress = show_progress
+        self.quiet = quiet
+        self.metrics = metrics if metrics is not None else CrawlMetrics()
+        self.on_progress = on_progress
+        self._start_time = None
+        self._console = None  # Created on first use; the output directory too, with the first file
+        
+        # Configurations to avoid detection. One User-Agent is kept for the whole
+        # crawl: rotating it per request defeats server-side connection reuse.
+        self.headers = {"User-Agent": random_user_agent()}
+        
+        # Targets by domain; every crawled URL belongs to the target on its host
+        self.targets = {}
+        for target in targets:
+            if isinstance(target, dict):
+                target = CrawlTarget(**target)
+            self.targets.setdefault(target.domain, target)
+        self.first_target = next(iter(self.targets.values()))
+        self.target_url = self.first_target.url
+        self.start_url = self.first_target.start_url
+        self.base_domain = self.first_target.domain
+        self.scheme = self.first_target.scheme
+        self.batch = len(self.targets) > 1
+        
+        # Links are kept when they are on the host of the page they were found on
+        self.skip_binary_links = skip_binary_links
+        self.analyzer = PageAnalyzer(self.keywords, None, self.parser_backend, skip_binary_links, self.detectors)
+        self.fetch_policy = FetchPolicy(max_page_size, extractors)
         
-        # Create output directory
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        # Findings are streamed to disk as they are found instead of kept in memory;
+        # a batch writes the findings of all its targets to the same files
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        base_filename = f"recon_batch_{timestamp}" if self.batch else f"recon_{self.base_domain}_{timestamp}"
+        if scan_id:
+            # Scans started in the same second (e.g. web jobs on one target) get files of their own
+            base_filename += "_" + re.sub(r"[^A-Za-z0-9_.-]", "_", scan_id)
+        
+        # Resumable crawl state; a resumed crawl keeps appending to the same files
+        self.state = None
+        if state_file:
+            self.state = CrawlStateStore(state_file)
+            if self.state.get_meta("config") is None:
+                self.state.set_meta("config", {
+                    "target_url": target_url,
+                    "keywords": self.keywords,
+                    "detectors": self.detector_names,
+                    "depth": depth,
+                    "output_dir": output_dir,
+                    "max_urls": max_urls,
+                    "ignore_robots": ignore_robots,
+                    "targets": [target.to_dict() for target in self.targets.values()] if self.batch else None
+                })
+                self.state.set_meta("base_filename", base_filename)
+            base_filename = self.state.get_meta("base_filename", base_filename)
         
-        # Configurations to avoid detection
-        self.user_agent = UserAgent()
-        self.headers = {"User-Agent": self.user_agent.random}
+        self.results_store = results_store
+        self.scan_id = scan_id or base_filename
+        self.sink = StreamingResultSink(output_dir, base_filename, store=results_store, scan_id=self.scan_id)
+        self.metrics_path = os.path.join(output_dir, f"{base_filename}_metrics.json")
         
-        # Parse target URL
-        parsed_url = urlparse(target_url)
-        self.base_domain = parsed_url.netloc
-        self.scheme = parsed_url.scheme
+        # Incremental scans: findings depend on the keywords, detectors and parser, so they key the index
+        self.fingerprints = None
+        self.changes = None
+        if incremental_index:
+            analysis = {"keywords": sorted(self.keywords), "parser": self.parser_backend}
+            if self.detector_names:  # Indexes of keyword-only scans stay valid
+                analysis["detectors"] = sorted(self.detector_names)
+            analysis_key = json.dumps(analysis)
+            self.fingerprints = FingerprintIndex(incremental_index, analysis_key)
+            self.changes = ChangeLog(os.path.join(output_dir, f"{base_filename}_changes.ndjson"))
         
-        # Initialize robots.txt parser
-        self.robot_parser = RobotFileParser()
+        # robots.txt is fetched per host on first use, through the crawl session
+        self.robots = None
         if not ignore_robots:
-            self._check_robots_txt()
+            self.robots = RobotsCache(self.headers["User-Agent"], cache_dir=cache_dir, ttl=robots_ttl,
+                                      on_rules=self._apply_robots)
         else:
             logging.info("Ignoring robots.txt as per configuration")
 
-    def _check_robots_txt(self):
-        """Check and parse robots.txt for the target site."""
-        robots_url = f"{self.scheme}://{self.base_domain}/robots.txt"
-        try:
-            response = requests.get(robots_url, timeout=5)
-            if response.status_code == 200:
-                self.robot_parser.parse(response.text.splitlines())
-                logging.info(f"Parsed robots.txt from {robots_url}")
-            else:
-                self.console.print(f"[yellow]No robots.txt found at {robots_url}[/yellow]")
-                logging.warning(f"No robots.txt found at {robots_url}")
-        except Exception as e:
-            self.console.print(f"[yellow]Error accessing robots.txt: {e}[/yellow]")
-            logging.error(f"Error accessing robots.txt: {e}")
+    @classmethod
+    def from_state(cls, state_file, **kwargs):
+        """
+        Rebuild a scraper from a saved crawl state in order to resume it.
+        
+        Args:
+            state_file (str): State file written by a previous run
+            **kwargs: Runtime options (concurrency, delay, ...) for this run
+            
+        Returns:
+            ReconScraper: Scraper configured like the interrupted run
+        """
+        store = CrawlStateStore(state_file)
+        config = store.get_meta("config")
+        store.close()
+        if config is None:
+            raise ValueError(f"No saved crawl found in {state_file}")
+        return cls(state_file=state_file, **config, **kwargs)
+    
+    @property
+    def console(self):
+        """Rich console the scraper prints to, created on first use."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
+    @console.setter
+    def console(self, console):
+        self._console = console
+    
+    def _report(self, message):
+        """Print a per-URL message, unless running quietly (it is logged either way)."""
+        if not self.quiet:
+            self.console.print(message)
+
+    def _apply_robots(self, host, rules):
+        """Pace a host by the Crawl-delay / Request-rate of its robots.txt once it is loaded."""
+        if self.scheduler is not None:
+            self.scheduler.set_robots(host, crawl_delay=rules.crawl_delay, request_rate=rules.request_rate)
+
+    def _target_for(self, url):
+        """Return the target a URL belongs to, or None."""
+        return self.targets.get(urlparse(url).netloc)
 
     async def _request_page(self, url, session):
         """
@@ -99,29 +251,87 @@ class ReconScraper:
         Returns:
             str: HTML content or None if error
         """
-        if not self.ignore_robots and not self.robot_parser.can_fetch(self.headers["User-Agent"], url):
-            self.console.print(f"[yellow]URL {url} blocked by robots.txt[/yellow]")
+        if self.robots is not None and not await self.robots.can_fetch(url, session):
+            self._report(f"[yellow]URL {url} blocked by robots.txt[/yellow]")
             logging.info(f"Skipped {url} due to robots.txt")
             return None
 
-        for attempt in range(3):  # Retry up to 3 times
+        cached = self.cache.lookup(url) if self.cache is not None else None
+        host = urlparse(url).netloc
+        budget = self.retry_policy.budget()
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            status = None
+            retry_after = None
             try:
-                self.headers["User-Agent"] = self.user_agent.random
-                async with session.get(url, headers=self.headers, timeout=15) as response:
+                headers = cached.conditional_headers() if cached is not None else None
+                started = time.monotonic()
+                async with session.get(url, headers=headers) as response:
+                    if self.scheduler is not None:
+                        self.scheduler.record_response(url, time.monotonic() - started, response.status,
+                                                       response.headers.get("Retry-After"))
+                    status = response.status
+                    if status < 500:
+                        self.circuit_breaker.record_success(host)
+                    if response.status == 304 and cached is not None:
+                        self.cache.record_hit(url, cached)
+                        logging.info(f"Not modified, served from cache: {url}")
+                        return cached.body
                     if response.status == 200:
-                        content = await response.text()
+                        with self.metrics.timer("download_seconds"):
+                            content = await self.fetch_policy.read(response, url)
+                        if content is None:
+                            return None
                         logging.info(f"Successfully fetched {url}")
+                        if self.cache is not None:
+                            self.cache.record_miss()
+                            self.cache.store(url, content, response.headers.get("ETag"),
+                                             response.headers.get("Last-Modified"))
                         return content
-                    else:
-                        self.console.print(f"[red]Error {response.status} for {url}[/red]")
+                    if response.status not in self.retry_policy.retry_statuses:
+                        self._report(f"[red]Error {response.status} for {url}[/red]")
                         logging.error(f"Error {response.status} for {url}")
+                        if status >= 500:
+                            self._record_host_failure(host)
                         return None
+                    kind = "status"
+                    error = f"status {response.status}"
+                    retry_after = response.headers.get("Retry-After")
             except Exception as e:
-                self.console.print(f"[red]Attempt {attempt+1} failed for {url}: {e}[/red]")
-                logging.error(f"Attempt {attempt+1} failed for {url}: {e}")
-                if attempt < 2:
-                    await asyncio.sleep(random.uniform(1, 3))  # Wait before retry
-        return None
+                kind = self.retry_policy.classify(e)
+                error = str(e) or type(e).__name__
+            
+            delay = budget.next_delay(kind, retry_after)
+            if delay is None:
+                self._report(f"[red]Attempt {attempt} failed for {url}: {error}, giving up[/red]")
+                logging.error(f"Attempt {attempt} failed for {url}: {error}, giving up")
+                # Connection problems and server errors count against the host, 4xx answers do not
+                if kind in ("connect", "read") or (status is not None and status >= 500):
+                    self._record_host_failure(host)
+                return None
+            self._report(f"[red]Attempt {attempt} failed for {url}: {error}, retrying in {delay:.1f}s[/red]")
+            logging.error(f"Attempt {attempt} failed for {url}: {error}, retrying in {delay:.1f}s")
+            self.retries += 1
+            self.metrics.inc("retries_total", reason=kind)
+            await asyncio.sleep(delay)
+    
+    def _record_host_failure(self, host):
+        """Feed a failed request to the circuit breaker and pause or drop the host if it trips."""
+        pause = self.circuit_breaker.record_failure(host)
+        if pause is None:
+            self.console.print(f"[yellow]{host} keeps failing, skipping its remaining URLs[/yellow]")
+            logging.warning(f"Circuit breaker: abandoned {host}")
+            self.metrics.inc("hosts_abandoned_total")
+            if self.scheduler is not None:
+                self.scheduler.clear(host)
+        elif pause:
+            self.console.print(f"[yellow]{host} is failing, pausing it for {pause:.0f}s[/yellow]")
+            logging.warning(f"Circuit breaker: paused {host} for {pause:.0f}s")
+            self.metrics.inc("circuit_open_total")
+            if self.scheduler is not None:
+                self.scheduler.pause(host, pause)
     
     def extract_links(self, html, current_url):
         """
@@ -137,18 +347,7 @@ class ReconScraper:
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
-        links = []
-        
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            full_url = urljoin(current_url, href)
-            parsed_url = urlparse(full_url)
-            
-            if parsed_url.netloc == self.base_domain:
-                links.append(full_url)
-                
-        links = list(set(links))
+        _, _, links = self._analyze_inline(html, current_url, True)
         logging.info(f"Extracted {len(links)} links from {current_url}")
         return links
     
@@ -163,216 +362,614 @@ class ReconScraper:
         Returns:
             list: List of findings
         """
-        if not html or not self.keywords:
+        if not html or not (self.keywords or self.detectors):
             logging.info(f"No HTML or keywords for {url}")
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
-        text = soup.get_text()
+        title, findings, _ = self._analyze_inline(html, url, False)
+        return self._record_findings(url, title, findings)
+    
+    def _analyze_inline(self, html, url, follow_links):
+        """Analyze a page on the event loop and record its stage timings."""
+        title, findings, links, timings = self.analyzer.analyze_timed(html, url, follow_links)
+        for name, seconds in timings.items():
+            self.metrics.observe(name, seconds)
+        return title, findings, links
+    
+    async def process_page(self, html, url, follow_links=True):
+        """
+        Parse a page once and run both keyword search and link extraction on it.
+        
+        The work runs in the analysis process pool when one is configured, so
+        the event loop keeps serving network I/O while large pages are parsed.
         
-        findings = []
-        for keyword in self.keywords:
-            pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-            matches = pattern.findall(text)
+        Args:
+            html (str): HTML content
+            url (str): Page URL
+            follow_links (bool): Whether same-domain links should be returned
             
-            if matches:
-                findings.append({
-                    "keyword": keyword,
-                    "occurrences": len(matches),
-                    "contexts": self._get_contexts(text, keyword, 30)
-                })
-                logging.info(f"Found {len(matches)} occurrences of '{keyword}' on {url}")
+        Returns:
+            tuple: (findings, links)
+        """
+        if not html:
+            return [], []
+        
+        previous = digest = None
+        if self.fingerprints is not None:
+            digest = content_hash(html)
+            previous = self.fingerprints.get(url)
+        
+        if self.fingerprints is not None and self.fingerprints.reusable_entry(previous, digest, follow_links):
+            title, findings = previous["title"], previous["findings"]
+            links = previous["links"] if follow_links else []
+            self.fingerprints.reused += 1
+            logging.info(f"Unchanged since the last scan, reusing its analysis: {url}")
+        else:
+            with self.metrics.timer("analysis_seconds"):
+                if self.analysis_pool is not None:
+                    title, findings, links, timings = await self.analysis_pool.analyze(html, url, follow_links)
+                    for name, seconds in timings.items():
+                        self.metrics.observe(name, seconds)
+                else:
+                    title, findings, links = self._analyze_inline(html, url, follow_links)
+            if self.fingerprints is not None:
+                self.fingerprints.analyzed += 1
+                self.fingerprints.record(url, digest, title, findings, links if follow_links else None)
+        
+        # Findings of an entry analyzed with other keywords or parser do not compare with these
+        if self.changes is not None and (previous is None or self.fingerprints.same_settings(previous)):
+            self.changes.write(url, title, diff_findings(previous["findings"] if previous else [], findings))
+        
+        if follow_links:
+            logging.info(f"Extracted {len(links)} links from {url}")
+        return self._record_findings(url, title, findings), links
+    
+    def _record_findings(self, url, title, findings):
+        """
+        Log the findings of a page and append them to the result files.
+        
+        Args:
+            url (str): Page URL
+            title (str): Page title
+            findings (list): Findings returned by the analyzer
+            
+        Returns:
+            list: List of findings
+        """
+        for finding in findings:
+            logging.info(f"Found {finding['occurrences']} occurrences of '{finding['keyword']}' on {url}")
         
         if findings:
             result = {
                 "url": url,
-                "title": self._get_page_title(soup),
+                "title": title,
                 "findings": findings
             }
-            self.results.append(result)
+            try:
+                self.sink.write(result)
+            except Exception as e:
+                self._report(f"[red]Failed to write results for {url}: {e}[/red]")
+                logging.error(f"Failed to write results for {url}: {e}")
             return findings
         
         logging.info(f"No keyword matches found on {url}")
         return []
     
-    def _get_contexts(self, text, keyword, context_size=30):
+    async def _crawl_worker(self, queue, session, progress, task):
         """
-        Extract context around keyword occurrences.
+        Pull URLs from the shared queue until the crawl is cancelled.
         
         Args:
-            text (str): Full text
-            keyword (str): Keyword to search
-            context_size (int): Characters before/after for context
+            queue (HostScheduler): Shared per-host queue of (url, depth) tuples
+            session: aiohttp ClientSession
+            progress (Progress): Progress display shared by all workers
+            task: Progress task identifier
+        """
+        while True:
+            current_url, current_depth = await queue.get()
+            try:
+                requeued = False
+                try:
+                    requeued = await self._crawl_url(current_url, current_depth, queue, session, progress, task)
+                except Exception as e:
+                    self._report(f"[red]Failed to process {current_url}: {e}[/red]")
+                    logging.error(f"Failed to process {current_url}: {e}", exc_info=True)
+                
+                # Not reached on cancellation, so an interrupted page is crawled again on resume;
+                # a requeued URL stays in the saved frontier for the same reason
+                if self.state is not None and not requeued:
+                    self.state.complete(current_url)
+                    if self.state.needs_flush():
+                        self._save_state()
+            finally:
+                queue.task_done()
+    
+    async def _crawl_url(self, current_url, current_depth, queue, session, progress, task):
+        """
+        Fetch and process one URL taken from the queue.
+        
+        Args:
+            current_url (str): URL to crawl
+            current_depth (int): Crawl depth of the URL
+            queue (HostScheduler): Shared crawl queue
+            session: aiohttp ClientSession
+            progress (Progress): Progress display shared by all workers
+            task: Progress task identifier
             
         Returns:
-            list: List of contexts (limited to 5)
+            bool: True if the URL was put back in the queue to be crawled later
         """
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        contexts = []
-        
-        for match in pattern.finditer(text):
-            start = max(0, match.start() - context_size)
-            end = min(len(text), match.end() + context_size)
-            context = text[start:end].replace('\n', ' ').strip()
-            contexts.append(f"...{context}...")
-            if len(contexts) >= 5:
-                break
-                
-        return contexts
+        # Claiming a URL and checking the budget happen without an await in
+        # between, so max_urls holds exactly whatever the worker count.
+        target = self._target_for(current_url)
+        if target is None:
+            return False
+        if target.exhausted:
+            queue.clear(target.domain)
+            return False
+        if current_url in self.visited_urls:
+            return False
+        
+        # A host whose circuit is open keeps its URLs queued until it may be tried again
+        host = urlparse(current_url).netloc
+        wait = self.circuit_breaker.before_request(host)
+        if wait is None:
+            return False
+        if wait:
+            queue.pause(host, wait)
+            queue.requeue(current_url, current_depth)
+            return True
+        probe = self.circuit_breaker.is_probing(host)
+        
+        self.visited_urls.add(current_url)
+        target.visited += 1
+        if self.state is not None:
+            self.state.mark_visited(current_url)
+        self.metrics.set_gauge("queue_depth", queue.qsize())
+        if not self.quiet:
+            progress.update(task, description=f"[cyan]Scraping {current_url}[/cyan]")
+        
+        try:
+            with self.metrics.timer("fetch_seconds"):
+                html = await self._request_page(current_url, session)
+        finally:
+            # Only the trial request may end the trial; others finishing meanwhile must not
+            if probe:
+                self.circuit_breaker.release(host)
+        if not html:
+            return False
+        self.metrics.inc("pages_total")
+        
+        follow_links = current_depth < target.depth
+        findings, links = await self.process_page(html, current_url, follow_links)
+        if findings:
+            self._report(f"[green]✓[/green] Found {len(findings)} result(s) on {current_url}")
+        
+        if not target.exhausted:
+            for link in links:
+                if link not in self.visited_urls:
+                    self._enqueue(link, current_depth + 1)
+        
+        if self.on_progress is not None:
+            self.on_progress(self.progress_snapshot())
+        return False
     
-    def _get_page_title(self, soup):
-        """Extract page title."""
-        title_tag = soup.find('title')
-        return title_tag.text if title_tag else "No title"
+    def progress_snapshot(self):
+        """
+        Describe how far the crawl has got.
         
+        Returns:
+            dict: Visited pages, pages with findings, queued URLs and pages per second
+        """
+        elapsed = time.monotonic() - self._start_time if self._start_time is not None else 0.0
+        return {
+            "pages": len(self.visited_urls),
+            "findings": self.sink.pages,
+            "queued": self.scheduler.qsize() if self.scheduler is not None else 0,
+            "rate": round(len(self.visited_urls) / elapsed, 2) if elapsed > 0 else 0.0
+        }
+    
+    def _enqueue(self, url, depth):
+        """
+        Add a URL to the crawl queue and to the saved frontier, unless it was queued before.
+        
+        Returns:
+            bool: True if the URL was queued
+        """
+        if not self.scheduler.put(url, depth):
+            return False
+        if self.state is not None:
+            self.state.enqueue(url, depth)
+        return True
+    
+    async def _seed_from_sitemaps(self, target, session):
+        """
+        Queue the pages listed in a target's sitemaps, most recently modified first.
+        
+        Sitemaps are read from the robots.txt `Sitemap:` lines and `/sitemap.xml`.
+        Listed pages are queued at depth 1, as if linked from the seed page, so deep
+        pages are reached without crawling the pages leading to them.
+        
+        Args:
+            target (CrawlTarget): Target to seed
+            session: aiohttp ClientSession
+        """
+        if target.depth < 1:
+            return
+        sitemap_urls = []
+        allowed = None
+        if self.robots is not None:
+            rules = await self.robots.rules_for(target.start_url, session)
+            sitemap_urls.extend(rules.sitemaps)
+            allowed = rules.allowed
+        sitemap_urls.append(f"{target.scheme}://{target.domain}/sitemap.xml")
+        
+        urls = await collect_sitemap_urls(session, sitemap_urls, target.domain, target.max_urls, allowed=allowed)
+        queued = sum(1 for url in urls if self._enqueue(url, 1))
+        self.console.print(f"[bold blue]Sitemaps:[/bold blue] {queued} URLs queued for {target.domain}")
+        logging.info(f"Queued {queued} URLs from the sitemaps of {target.domain}")
+    
+    def _write_metrics(self):
+        """Print the main latency figures and save every metric as JSON next to the results."""
+        summary = self.metrics.to_dict()
+        histograms = summary["histograms"]
+        stages = [f"{name[:-len('_seconds')]} p50 {histograms[name]['p50'] * 1000:.0f}ms / "
+                  f"p90 {histograms[name]['p90'] * 1000:.0f}ms"
+                  for name in ("ttfb_seconds", "download_seconds", "parse_seconds", "match_seconds")
+                  if name in histograms]
+        if stages:
+            self.console.print(f"[bold blue]Latency:[/bold blue] {', '.join(stages)}")
+        
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(self.metrics_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            self.console.print(f"[bold blue]Metrics:[/bold blue] {self.metrics_path}")
+        except OSError as e:
+            logging.error(f"Failed to write metrics to {self.metrics_path}: {e}")
+    
+    def _save_state(self):
+        """Write buffered crawl state, after the results it refers to are on disk."""
+        self.sink.flush()
+        self.state.flush(progress=self.sink.snapshot())
+    
     async def crawl(self):
         """
         Run the async crawling and scraping process.
+        
+        URLs are fetched by `concurrency` workers sharing one queue, so at most
+        that many requests are in flight at any time. Politeness delays are
+        enforced per host by the scheduler rather than by sleeping in the workers.
         """
         self.console.print(f"[bold green]╔══════════════════════════════════════╗[/bold green]")
         self.console.print(f"[bold green]║    RECONNAISSANCE SCRAPER ACTIF      ║[/bold green]")
         self.console.print(f"[bold green]╚══════════════════════════════════════╝[/bold green]")
-        self.console.print(f"[bold blue]Target URL:[/bold blue] {self.target_url}")
+        total_budget = sum(target.max_urls for target in self.targets.values())
+        if self.batch:
+            self.console.print(f"[bold blue]Targets:[/bold blue] {len(self.targets)}")
+        else:
+            self.console.print(f"[bold blue]Target URL:[/bold blue] {self.target_url}")
         self.console.print(f"[bold blue]Keywords:[/bold blue] {', '.join(self.keywords) if self.keywords else 'None'}")
-        self.console.print(f"[bold blue]Depth:[/bold blue] {self.depth}")
-        self.console.print(f"[bold blue]Max URLs:[/bold blue] {self.max_urls}")
+        if self.detectors:
+            self.console.print(f"[bold blue]Detectors:[/bold blue] {', '.join(self.detector_names)}")
+        if not self.batch:
+            self.console.print(f"[bold blue]Depth:[/bold blue] {self.first_target.depth}")
+        self.console.print(f"[bold blue]Max URLs:[/bold blue] {total_budget}")
+        self.console.print(f"[bold blue]Concurrency:[/bold blue] {self.concurrency}")
+        self.console.print(f"[bold blue]HTML parser:[/bold blue] {self.parser_backend}")
+        if self.parse_workers:
+            self.console.print(f"[bold blue]Parse workers:[/bold blue] {self.parse_workers}")
         self.console.print()
         
-        to_crawl = [(self.target_url, 0)]  # (url, depth)
+        # Links beyond what the remaining budget could plausibly use are not kept in memory
+        self.scheduler = HostScheduler(delay=self.delay, host_concurrency=self.concurrency,
+                                       max_pending=max(1000, 10 * total_budget))
+        
+        resumed = self.state is not None and self.state.has_progress()
+        if resumed:
+            self.visited_urls, frontier = self.state.load()
+            self.scheduler.mark_seen(self.visited_urls)
+            self.sink.restore(self.state.get_meta("progress", {}))
+            for url in self.visited_urls:
+                target = self._target_for(url)
+                if target is not None:
+                    target.visited += 1
+            for url, depth in frontier:
+                self.scheduler.put(url, depth)
+            self.console.print(f"[bold blue]Resuming:[/bold blue] {len(self.visited_urls)} URLs visited, "
+                               f"{len(frontier)} queued")
+            logging.info(f"Resuming crawl from {self.state.path}: {len(self.visited_urls)} visited, "
+                         f"{len(frontier)} queued")
+        else:
+            # Seeds enter the scheduler together, so all targets are crawled side by side
+            for target in self.targets.values():
+                self._enqueue(target.start_url, 0)
+        if self.parse_workers:
+            self.analysis_pool = AnalysisPool(self.keywords, None, self.parser_backend,
+                                              workers=self.parse_workers, backlog=self.parse_backlog,
+                                              skip_binary_links=self.skip_binary_links,
+                                              detectors=self.detectors)
+        self._start_time = time.monotonic()
+        if self.results_store is not None:
+            description = ", ".join(self.targets) if self.batch else self.target_url
+            self.results_store.start_scan(self.scan_id, description, self.keywords + self.detector_names, {
+                "json": os.path.basename(self.sink.ndjson_path),
+                "csv": os.path.basename(self.sink.csv_path)
+            })
         
-        async with aiohttp.ClientSession() as session:
-            with Progress() as progress:
+        async with create_session(self.transport, self.connection_stats, self.headers, self.concurrency,
+                                  metrics=self.metrics) as session:
+            if self.use_sitemaps and not resumed:
+                await asyncio.gather(*(self._seed_from_sitemaps(target, session)
+                                       for target in self.targets.values()))
+            from rich.progress import Progress
+            
+            # Disabled for background jobs: only one live display can run per console
+            with Progress(console=self.console, disable=not self.show_progress) as progress:
                 task = progress.add_task("[cyan]Scraping...", total=None)
                 
-                while to_crawl and len(self.visited_urls) < self.max_urls:
-                    current_url, current_depth = to_crawl.pop(0)
-                    
-                    if current_url in self.visited_urls:
-                        continue
-                    
-                    self.visited_urls.add(current_url)
-                    progress.update(task, description=f"[cyan]Scraping {current_url}[/cyan]")
-                    
-                    html = await self._request_page(current_url, session)
-                    if not html:
-                        continue
-                    
-                    findings = self.search_keywords(html, current_url)
-                    if findings:
-                        progress.console.print(f"[green]✓[/green] Found {len(findings)} result(s) on {current_url}")
-                    
-                    if current_depth < self.depth:
-                        links = self.extract_links(html, current_url)
-                        for link in links:
-                            if link not in self.visited_urls:
-                                to_crawl.append((link, current_depth + 1))
-                    
-                    await asyncio.sleep(random.uniform(0.5, 1.5))
+                workers = [
+                    asyncio.create_task(self._crawl_worker(self.scheduler, session, progress, task))
+                    for _ in range(self.concurrency)
+                ]
+                completed = False
+                try:
+                    await self.scheduler.join()
+                    completed = True
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+                    if self.analysis_pool is not None:
+                        self.analysis_pool.shutdown()
+                        self.analysis_pool = None
+                    if self.state is not None:
+                        self._save_state()
+                    if self.fingerprints is not None:
+                        self.fingerprints.close()
+                        self.changes.close()
+                    if self.results_store is not None:
+                        self.results_store.finish_scan(self.scan_id, "completed" if completed else "interrupted",
+                                                       self.sink.pages, self.sink.findings)
+        
+        self.elapsed = time.monotonic() - self._start_time
+        pages_per_second = len(self.visited_urls) / self.elapsed if self.elapsed > 0 else 0.0
         
         self.console.print(f"\n[bold green]Scraping completed![/bold green]")
         self.console.print(f"[bold blue]URLs visited:[/bold blue] {len(self.visited_urls)}")
-        self.console.print(f"[bold blue]Results found:[/bold blue] {len(self.results)}")
-        logging.info(f"Scraping completed: {len(self.visited_urls)} URLs visited, {len(self.results)} results found")
+        self.console.print(f"[bold blue]Results found:[/bold blue] {self.sink.pages}")
+        self.console.print(f"[bold blue]Elapsed:[/bold blue] {self.elapsed:.1f}s ({pages_per_second:.2f} pages/sec)")
+        self.console.print(f"[bold blue]Connections:[/bold blue] {self.connection_stats.summary()}")
+        logging.info(f"Connections: {self.connection_stats.summary()}")
+        self.console.print(f"[bold blue]Responses:[/bold blue] {self.fetch_policy.summary()}")
+        logging.info(f"Responses: {self.fetch_policy.summary()}")
+        retries = f"{self.retries} retried request(s), {self.circuit_breaker.summary()}"
+        self.console.print(f"[bold blue]Retries:[/bold blue] {retries}")
+        logging.info(f"Retries: {retries}")
+        self._write_metrics()
+        if self.fingerprints is not None:
+            counts = self.changes.counts
+            self.console.print(f"[bold blue]Incremental:[/bold blue] {self.fingerprints.reused} unchanged page(s) "
+                               f"reused, {self.fingerprints.analyzed} analyzed")
+            self.console.print(f"[bold blue]Changes:[/bold blue] {counts['new']} new, {counts['removed']} removed, "
+                               f"{counts['changed']} changed" + (f" ({self.changes.path})" if self.changes.total else ""))
+            logging.info(f"Incremental scan: {self.fingerprints.reused} reused, {self.fingerprints.analyzed} analyzed, "
+                         f"changes {counts}")
+        if self.cache is not None:
+            self.console.print(f"[bold blue]HTTP cache:[/bold blue] {self.cache.summary()}")
+            logging.info(f"HTTP cache: {self.cache.summary()}")
+        logging.info(f"Scraping completed: {len(self.visited_urls)} URLs visited, {self.sink.pages} results found, "
+                     f"{pages_per_second:.2f} pages/sec")
     
     def save_results(self):
         """
-        Save results in JSON and CSV formats.
+        Flush and close the JSON (NDJSON) and CSV result files.
+        
+        Results are appended to these files during the crawl, so this only
+        finalizes them; calling it after an interruption keeps partial results.
         """
-        if not self.results:
+        if not self.sink.pages:
             self.console.print("[yellow]No results to save.[/yellow]")
             logging.warning("No results to save")
             return
         
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        base_filename = f"recon_{urlparse(self.target_url).netloc}_{timestamp}"
-        
-        json_path = os.path.join(self.output_dir, f"{base_filename}.json")
-        csv_path = os.path.join(self.output_dir, f"{base_filename}.csv")
-        
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, ensure_ascii=False, indent=4)
-            logging.info(f"Successfully saved JSON to {json_path}")
-        except Exception as e:
-            self.console.print(f"[red]Failed to save JSON: {e}[/red]")
-            logging.error(f"Failed to save JSON to {json_path}: {e}")
-        
-        try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['URL', 'Title', 'Keyword', 'Occurrences', 'Context'])
-                
-                for result in self.results:
-                    url = result['url']
-                    title = result['title']
-                    
-                    for finding in result['findings']:
-                        keyword = finding['keyword']
-                        occurrences = finding['occurrences']
-                        contexts = finding.get('contexts', [])
-                        for context in contexts:
-                            writer.writerow([url, title, keyword, occurrences, context])
-            logging.info(f"Successfully saved CSV to {csv_path}")
+            self.sink.close()
+            logging.info(f"Successfully saved results to {self.sink.ndjson_path} and {self.sink.csv_path}")
         except Exception as e:
-            self.console.print(f"[red]Failed to save CSV: {e}[/red]")
-            logging.error(f"Failed to save CSV to {csv_path}: {e}")
+            self.console.print(f"[red]Failed to save results: {e}[/red]")
+            logging.error(f"Failed to save results: {e}")
         
         self.console.print(f"[bold green]Results saved to:[/bold green]")
-        self.console.print(f"  - JSON: {json_path}")
-        self.console.print(f"  - CSV: {csv_path}")
+        self.console.print(f"  - NDJSON: {self.sink.ndjson_path}")
+        self.console.print(f"  - CSV: {self.sink.csv_path}")
     
     def display_results(self):
         """
         Display a summary of results.
         """
-        if not self.results:
+        if not self.sink.pages:
             self.console.print("[yellow]No results to display.[/yellow]")
             logging.warning("No results to display")
             return
         
+        from rich.table import Table
+        
         table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("URL")
-        table.add_column("Title")
         table.add_column("Keyword")
+        table.add_column("Pages", justify="right")
         table.add_column("Occurrences", justify="right")
         
-        for result in self.results:
-            url = result['url']
-            title = result['title']
-            
-            for finding in result['findings']:
-                keyword = finding['keyword']
-                occurrences = finding['occurrences']
-                
-                table.add_row(
-                    url if url else "N/A",
-                    title if title else "N/A",
-                    keyword if keyword else "N/A",
-                    str(occurrences)
-                )
+        for keyword, stats in self.sink.keyword_stats.items():
+            table.add_row(
+                keyword if keyword else "N/A",
+                str(stats["pages"]),
+                str(stats["occurrences"])
+            )
         
         self.console.print("\n[bold]Results Summary:[/bold]")
+        self.console.print(f"{self.sink.pages} page(s) with findings, {self.sink.findings} finding(s)")
         self.console.print(table)
+        
+        if self.batch:
+            target_table = Table(show_header=True, header_style="bold magenta")
+            target_table.add_column("Target")
+            target_table.add_column("URLs visited", justify="right")
+            target_table.add_column("Max URLs", justify="right")
+            for target in self.targets.values():
+                target_table.add_row(target.domain, str(target.visited), str(target.max_urls))
+            self.console.print(target_table)
 
 def main():
     parser = argparse.ArgumentParser(description='ReconScraper - Ethical Web Scraper for Reconnaissance')
-    parser.add_argument('--url', '-u', required=True, help='Target URL to scrape')
+    parser.add_argument('--url', '-u', help='Target URL to scrape')
+    parser.add_argument('--targets-file',
+                        help='Crawl every site listed in this file in one batch '
+                             '(one URL per line, optionally followed by max_urls=N and/or depth=N)')
     parser.add_argument('--keywords', '-k', nargs='+', help='Keywords to search')
-    parser.add_argument('--depth', '-d', type=int, default=1, help='Crawling depth (default: 1)')
+    parser.add_argument('--detectors', nargs='+', metavar='NAME',
+                        help='Also search pages for secrets and personal data with these built-in detectors '
+                             '("all" for every one, see --list-detectors)')
+    parser.add_argument('--list-detectors', action='store_true', help='List the built-in detectors and exit')
+    parser.add_argument('--depth', '-d', type=int, default=1, help='Crawling depth (default: 1, per site in a batch)')
     parser.add_argument('--output', '-o', default='results', help='Output directory (default: results)')
-    parser.add_argument('--max-urls', type=int, default=100, help='Maximum URLs to crawl (default: 100)')
+    parser.add_argument('--max-urls', type=int, default=100,
+                        help='Maximum URLs to crawl (default: 100, per site in a batch)')
     parser.add_argument('--ignore-robots', action='store_true', help='Ignore robots.txt for testing')
+    parser.add_argument('--concurrency', '-c', type=int, default=5, help='Maximum concurrent requests (default: 5)')
+    parser.add_argument('--delay', type=float, default=0.5,
+                        help='Minimum seconds between requests to the same host (default: 0.5)')
+    parser.add_argument('--parser', choices=AVAILABLE_BACKENDS, default=DEFAULT_BACKEND,
+                        help=f'HTML parser backend (default: {DEFAULT_BACKEND})')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Processes for parsing and keyword matching (default: 0, run inline)')
+    parser.add_argument('--parse-backlog', type=int,
+                        help='Maximum pages waiting for a parse worker (default: 2 per worker)')
+    parser.add_argument('--conn-limit', type=int, help='Maximum open connections (default: concurrency)')
+    parser.add_argument('--conn-per-host', type=int, help='Maximum open connections per host (default: conn-limit)')
+    parser.add_argument('--keepalive', type=float, default=30.0,
+                        help='Seconds idle connections are kept for reuse (default: 30)')
+    parser.add_argument('--dns-ttl', type=int, default=300, help='Seconds DNS results are cached (default: 300)')
+    parser.add_argument('--connect-timeout', type=float, default=10.0, help='Connect timeout in seconds (default: 10)')
+    parser.add_argument('--read-timeout', type=float, default=15.0,
+                        help='Maximum seconds between two reads of a response (default: 15)')
+    parser.add_argument('--connect-retries', type=int, default=2,
+                        help='Retries after a connection error (default: 2)')
+    parser.add_argument('--read-retries', type=int, default=2,
+                        help='Retries after a read timeout or dropped connection (default: 2)')
+    parser.add_argument('--status-retries', type=int, default=2,
+                        help='Retries after a 408/425/429/5xx response, honouring Retry-After (default: 2)')
+    parser.add_argument('--retry-backoff', type=float, default=1.0,
+                        help='Seconds before the first retry, doubled for each retry (default: 1)')
+    parser.add_argument('--max-retry-delay', type=float, default=30.0,
+                        help='Longest wait before a retry in seconds (default: 30)')
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help='Consecutive failures that pause a host (default: 5, 0 disables)')
+    parser.add_argument('--breaker-timeout', type=float, default=30.0,
+                        help='Seconds a failing host is paused, doubled each time it trips again (default: 30)')
+    parser.add_argument('--no-compression', action='store_true', help='Do not ask servers for compressed responses')
+    parser.add_argument('--cache-dir', help='Cache pages here and revalidate them with conditional requests')
+    parser.add_argument('--cache-size', type=int, default=500, help='Maximum HTTP cache size in MB (default: 500)')
+    parser.add_argument('--sitemaps', action='store_true',
+                        help='Seed the crawl with the URLs listed in robots.txt sitemaps and /sitemap.xml')
+    parser.add_argument('--robots-ttl', type=float, default=24,
+                        help='Hours a fetched robots.txt is reused, across runs with --cache-dir (default: 24)')
+    parser.add_argument('--max-page-size', type=float, default=10,
+                        help='Maximum response size read in MB: responses whose Content-Length exceeds it are '
+                             'skipped, longer ones without a Content-Length are truncated (default: 10)')
+    parser.add_argument('--html-only', action='store_true',
+                        help='Skip every non-HTML response instead of extracting text (plain text, PDF with pypdf)')
+    parser.add_argument('--skip-binary-links', action='store_true',
+                        help='Do not queue links to images, archives, media and other binary files')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Do not print per-URL messages (they are still logged to scraper.log)')
+    parser.add_argument('--incremental', metavar='INDEX_FILE',
+                        help='Reuse the analysis of pages unchanged since the last scan recorded in this file, '
+                             'and write new/removed/changed findings to a *_changes.ndjson file')
+    parser.add_argument('--results-db', metavar='DB_FILE',
+                        help='Also index the findings in this SQLite file, searchable from the web interface')
+    parser.add_argument('--state-file', help='Record crawl progress in this file so the crawl can be resumed')
+    parser.add_argument('--resume', metavar='STATE_FILE',
+                        help='Resume an interrupted crawl from its state file (target and keywords are reused)')
     
     args = parser.parse_args()
+    if args.list_detectors:
+        for name, detector in BUILTIN_DETECTORS.items():
+            print(f"{name:<20} {detector.description}")
+        return
+    if not args.url and not args.targets_file and not args.resume:
+        parser.error('--url or --targets-file is required unless --resume is given')
+    if args.url and args.targets_file:
+        parser.error('--url and --targets-file cannot be used together')
+    if args.detectors:
+        try:
+            resolve_detectors(args.detectors)
+        except ValueError as e:
+            parser.error(str(e))
     
-    scraper = ReconScraper(
-        target_url=args.url,
-        keywords=args.keywords,
-        depth=args.depth,
-        output_dir=args.output,
-        max_urls=args.max_urls,
-        ignore_robots=args.ignore_robots
+    results_store = ResultsStore(args.results_db) if args.results_db else None
+    runtime_options = dict(
+        concurrency=args.concurrency,
+        delay=args.delay,
+        parser_backend=args.parser,
+        parse_workers=args.parse_workers,
+        parse_backlog=args.parse_backlog,
+        cache_dir=args.cache_dir,
+        cache_size=args.cache_size * 1024 * 1024,
+        robots_ttl=args.robots_ttl * 3600,
+        use_sitemaps=args.sitemaps,
+        incremental_index=args.incremental,
+        max_page_size=int(args.max_page_size * 1024 * 1024),
+        extractors={} if args.html_only else None,
+        skip_binary_links=args.skip_binary_links,
+        quiet=args.quiet,
+        transport=TransportConfig(
+            limit=args.conn_limit,
+            limit_per_host=args.conn_per_host,
+            keepalive_timeout=args.keepalive,
+            dns_ttl=args.dns_ttl,
+            compression=not args.no_compression,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout
+        ),
+        retry_policy=RetryPolicy(
+            connect_retries=args.connect_retries,
+            read_retries=args.read_retries,
+            status_retries=args.status_retries,
+            base_delay=args.retry_backoff,
+            max_delay=args.max_retry_delay
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=args.breaker_threshold,
+            reset_timeout=args.breaker_timeout
+        ),
+        results_store=results_store
     )
+    if args.resume:
+        if not os.path.exists(args.resume):
+            parser.error(f'State file not found: {args.resume}')
+        scraper = ReconScraper.from_state(args.resume, **runtime_options)
+    else:
+        targets = None
+        if args.targets_file:
+            try:
+                targets = load_targets(args.targets_file, max_urls=args.max_urls, depth=args.depth)
+            except (OSError, ValueError) as e:
+                parser.error(f'Cannot read targets: {e}')
+            if not targets:
+                parser.error(f'No targets found in {args.targets_file}')
+        scraper = ReconScraper(
+            target_url=args.url,
+            targets=targets,
+            keywords=args.keywords,
+            detectors=args.detectors,
+            depth=args.depth,
+            output_dir=args.output,
+            max_urls=args.max_urls,
+            ignore_robots=args.ignore_robots,
+            state_file=args.state_file,
+            **runtime_options
+        )
     
     try:
         asyncio.run(scraper.crawl())
@@ -381,12 +978,15 @@ def main():
     except KeyboardInterrupt:
         print("\nOperation interrupted by user.")
         logging.info("Operation interrupted by user")
+        scraper.save_results()
         sys.exit(1)
     except Exception as e:
         logging.error(f"Scraping failed: {e}")
         print(f"Scraping failed: {e}")
+    finally:
+        if results_store is not None:
+            results_store.close()
 
 if __name__ == '__main__':
-    import requests
     import sys
     main()
\ No newline at end of file
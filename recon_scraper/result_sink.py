@@ -0,0 +1,167 @@
+import csv
+import json
+import logging
+import os
+import time
+
+
+class StreamingResultSink:
+    """
+    Append page results to NDJSON and CSV files as soon as they are produced.
+
+    Nothing but aggregate counters is kept in memory, so memory stays flat on
+    large crawls. Writes are buffered and flushed every `flush_every` results or
+    `flush_interval` seconds, which keeps partial results on disk if the crawl
+    crashes or is interrupted. Files are only created when the first result
+    arrives. When a results store is given, findings are also indexed there
+    under `scan_id`, flushed along with the files.
+    """
+
+    CSV_HEADER = ['URL', 'Title', 'Keyword', 'Occurrences', 'Context']
+
+    def __init__(self, output_dir, base_filename, flush_every=50, flush_interval=5.0, buffer_size=1024 * 1024,
+                 store=None, scan_id=None):
+        """
+        Args:
+            output_dir (str): Directory to save results
+            base_filename (str): File name without extension
+            flush_every (int): Flush after this many results
+            flush_interval (float): Flush when this many seconds passed since the last flush
+            buffer_size (int): Size of the file write buffers in bytes
+            store (ResultsStore): Store indexing the findings (None writes files only)
+            scan_id (str): Scan the findings belong to in the store
+        """
+        self.output_dir = output_dir
+        self.ndjson_path = os.path.join(output_dir, f"{base_filename}.ndjson")
+        self.csv_path = os.path.join(output_dir, f"{base_filename}.csv")
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.store = store
+        self.scan_id = scan_id
+
+        # Aggregates used for the end-of-run summary
+        self.pages = 0
+        self.findings = 0
+        self.keyword_stats = {}  # keyword -> {"pages": int, "occurrences": int}
+
+        self._ndjson_file = None
+        self._csv_file = None
+        self._csv_writer = None
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self._ndjson_file is not None
+
+    def snapshot(self):
+        """Return the aggregate counters as a JSON-serializable dict."""
+        return {"pages": self.pages, "findings": self.findings, "keyword_stats": self.keyword_stats}
+
+    def restore(self, snapshot):
+        """
+        Restore aggregate counters saved by `snapshot()`, e.g. when resuming a crawl.
+
+        Args:
+            snapshot (dict): Counters returned by `snapshot()`
+        """
+        self.pages = snapshot.get("pages", 0)
+        self.findings = snapshot.get("findings", 0)
+        self.keyword_stats = snapshot.get("keyword_stats", {})
+
+    def open(self):
+        """Open both output files for appending, writing the CSV header if needed."""
+        if self.is_open:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._ndjson_file = open(self.ndjson_path, 'a', encoding='utf-8', buffering=self.buffer_size)
+        new_csv = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        self._csv_file = open(self.csv_path, 'a', newline='', encoding='utf-8', buffering=self.buffer_size)
+        self._csv_writer = csv.writer(self._csv_file)
+        if new_csv:
+            self._csv_writer.writerow(self.CSV_HEADER)
+        self._last_flush = time.monotonic()
+        logging.info(f"Streaming results to {self.ndjson_path} and {self.csv_path}")
+
+    def write(self, result):
+        """
+        Append the findings of one page.
+
+        Args:
+            result (dict): {"url", "title", "findings"} for a page
+        """
+        if not self.is_open:
+            self.open()
+
+        self._ndjson_file.write(json.dumps(result, ensure_ascii=False))
+        self._ndjson_file.write('\n')
+        if self.store is not None:
+            self.store.add_result(self.scan_id, result)
+
+        url = result['url']
+        title = result['title']
+        for finding in result['findings']:
+            keyword = finding['keyword']
+            occurrences = finding['occurrences']
+            for context in finding.get('contexts', []):
+                self._csv_writer.writerow([url, title, keyword, occurrences, context])
+
+            stats = self.keyword_stats.setdefault(keyword, {"pages": 0, "occurrences": 0})
+            stats["pages"] += 1
+            stats["occurrences"] += occurrences
+            self.findings += 1
+        self.pages += 1
+
+        self._unflushed += 1
+        if (self._unflushed >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Hand buffered results over to the operating system."""
+        if not self.is_open:
+            return
+        self._ndjson_file.flush()
+        self._csv_file.flush()
+        if self.store is not None:
+            self.store.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush and close the output files."""
+        if not self.is_open:
+            return
+        self.flush()
+        self._ndjson_file.close()
+        self._csv_file.close()
+        self._ndjson_file = self._csv_file = self._csv_writer = None
+
+
+def read_ndjson(path, limit=None):
+    """
+    Read results back from an NDJSON file.
+
+    Args:
+        path (str): NDJSON file path
+        limit (int): Maximum number of results to read (None reads all)
+
+    Returns:
+        list: Result dictionaries
+    """
+    results = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                # A crash can leave a truncated last line behind
+                logging.warning(f"Skipping malformed line in {path}")
+                continue
+            if limit is not None and len(results) >= limit:
+                break
+    return results
@@ -0,0 +1,386 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from result_sink import read_ndjson
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 query matching every word, whatever characters it contains."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class ResultsStore:
+    """
+    Indexed store of every scan and its findings, in SQLite.
+
+    One row is stored per finding (page URL, keyword, occurrences, contexts),
+    indexed by scan, keyword, domain and URL, and by full text with FTS5 when
+    the SQLite build provides it (otherwise text search falls back to LIKE).
+    Queries are paginated by finding ID, so a page of results costs the same at
+    the end of a scan of millions of findings as at the start. Writes from the
+    crawl are batched; the store is shared between threads (crawl jobs and web
+    requests) behind a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scans (
+            id TEXT PRIMARY KEY,
+            target TEXT,
+            keywords TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL,
+            pages INTEGER NOT NULL DEFAULT 0,
+            findings INTEGER NOT NULL DEFAULT 0,
+            files TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS findings (
+            id INTEGER PRIMARY KEY,
+            scan_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            domain TEXT NOT NULL,
+            title TEXT,
+            keyword TEXT NOT NULL,
+            occurrences INTEGER NOT NULL,
+            contexts TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS findings_scan ON findings (scan_id, id);
+        CREATE INDEX IF NOT EXISTS findings_keyword ON findings (keyword, id);
+        CREATE INDEX IF NOT EXISTS findings_domain ON findings (domain, id);
+        CREATE INDEX IF NOT EXISTS findings_url ON findings (url);
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS findings_fts USING fts5(
+            title, keyword, contexts, content='findings', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS findings_fts_insert AFTER INSERT ON findings BEGIN
+            INSERT INTO findings_fts (rowid, title, keyword, contexts)
+            VALUES (new.id, new.title, new.keyword, new.contexts);
+        END;
+        CREATE TRIGGER IF NOT EXISTS findings_fts_delete AFTER DELETE ON findings BEGIN
+            INSERT INTO findings_fts (findings_fts, rowid, title, keyword, contexts)
+            VALUES ('delete', old.id, old.title, old.keyword, old.contexts);
+        END;
+    """
+
+    COLUMNS = "f.id, f.scan_id, f.url, f.domain, f.title, f.keyword, f.occurrences, f.contexts"
+
+    def __init__(self, path, batch_size=500):
+        """
+        Args:
+            path (str): SQLite database file
+            batch_size (int): Buffered findings that trigger a write
+        """
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        try:
+            self._conn.executescript(self.FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            logging.warning("SQLite was built without FTS5, text search in results will be slower")
+            self.full_text = False
+        self._pending = []
+
+    def start_scan(self, scan_id, target, keywords, files=None):
+        """
+        Register a scan, or mark a resumed scan as running again.
+
+        Args:
+            scan_id (str): Scan identifier
+            target (str): Target URL (or a description of a batch)
+            keywords (list): Keywords searched
+            files (dict): Result files by format, e.g. {"json": name, "csv": name}
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO scans (id, target, keywords, status, started_at, files) VALUES (?, ?, ?, 'running', ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = 'running', finished_at = NULL",
+                (scan_id, target, json.dumps(keywords), time.time(), json.dumps(files or {}))
+            )
+
+    def finish_scan(self, scan_id, status, pages, findings):
+        """
+        Record the outcome of a scan, writing its pending findings first.
+
+        Args:
+            scan_id (str): Scan identifier
+            status (str): "completed", "failed" or "interrupted"
+            pages (int): Pages with findings
+            findings (int): Findings
+        """
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.execute("UPDATE scans SET status = ?, finished_at = ?, pages = ?, findings = ? WHERE id = ?",
+                                   (status, time.time(), pages, findings, scan_id))
+
+    def add_result(self, scan_id, result):
+        """
+        Queue the findings of one page for writing.
+
+        Args:
+            scan_id (str): Scan identifier
+            result (dict): {"url", "title", "findings"} as written to the NDJSON file
+        """
+        url = result["url"]
+        domain = urlparse(url).netloc
+        with self._lock:
+            for finding in result["findings"]:
+                self._pending.append((scan_id, url, domain, result.get("title"), finding["keyword"],
+                                      finding["occurrences"],
+                                      json.dumps(finding.get("contexts", []), ensure_ascii=False)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write queued findings in a single transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO findings (scan_id, url, domain, title, keyword, occurrences, contexts) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", pending
+                    )
+            except sqlite3.Error as e:
+                logging.error(f"Failed to write findings to {self.path}: {e}")
+                self._pending = pending + self._pending
+
+    def get_scan(self, scan_id):
+        """Return a scan as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, target, keywords, status, started_at, finished_at, pages, findings, files "
+                "FROM scans WHERE id = ?", (scan_id,)
+            ).fetchone()
+        return self._scan_dict(row) if row else None
+
+    def list_scans(self, limit=50, offset=0):
+        """
+        List scans, newest first.
+
+        Args:
+            limit (int): Maximum number of scans returned
+            offset (int): Scans skipped
+
+        Returns:
+            tuple: (list of scan dicts, total number of scans)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, target, keywords, status, started_at, finished_at, pages, findings, files "
+                "FROM scans ORDER BY started_at DESC LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+            total = self._conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
+        return [self._scan_dict(row) for row in rows], total
+
+    @staticmethod
+    def _scan_dict(row):
+        scan_id, target, keywords, status, started_at, finished_at, pages, findings, files = row
+        return {
+            "id": scan_id,
+            "target": target,
+            "keywords": json.loads(keywords),
+            "status": status,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "pages": pages,
+            "findings": findings,
+            "files": json.loads(files),
+        }
+
+    def search(self, text=None, keyword=None, url=None, domain=None, scan_id=None, limit=50, before=None):
+        """
+        Query findings, newest first.
+
+        Args:
+            text (str): Words to find in titles, keywords and contexts
+            keyword (str): Exact keyword
+            url (str): URL prefix
+            domain (str): Exact domain (netloc)
+            scan_id (str): Scan identifier
+            limit (int): Maximum number of findings returned
+            before (int): Only return findings with a lower ID (the `next` value of the previous page)
+
+        Returns:
+            tuple: (list of finding dicts, ID to pass as `before` for the next page, or None)
+        """
+        clauses = []
+        params = []
+        source = "findings f"
+        if text:
+            if self.full_text:
+                source = "findings_fts JOIN findings f ON f.id = findings_fts.rowid"
+                clauses.append("findings_fts MATCH ?")
+                params.append(_fts_query(text))
+            else:
+                for word in text.split():
+                    clauses.append("(f.contexts LIKE ? OR f.title LIKE ? OR f.keyword LIKE ?)")
+                    params.extend([f"%{word}%"] * 3)
+        if keyword:
+            clauses.append("f.keyword = ?")
+            params.append(keyword)
+        if url:
+            # A range instead of LIKE, so the URL index is used
+            clauses.append("f.url >= ? AND f.url < ?")
+            params.extend([url, url + "\U0010ffff"])
+        if domain:
+            clauses.append("f.domain = ?")
+            params.append(domain)
+        if scan_id:
+            clauses.append("f.scan_id = ?")
+            params.append(scan_id)
+        if before is not None:
+            clauses.append("f.id < ?")
+            params.append(before)
+
+        query = f"SELECT {self.COLUMNS} FROM {source}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY f.id DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._lock:
+            try:
+                rows = self._conn.execute(query, params).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search: {e}") from e
+
+        findings = [self._finding_dict(row) for row in rows[:limit]]
+        next_before = findings[-1]["id"] if len(rows) > limit else None
+        return findings, next_before
+
+    @staticmethod
+    def _finding_dict(row):
+        finding_id, scan_id, url, domain, title, keyword, occurrences, contexts = row
+        return {
+            "id": finding_id,
+            "scan_id": scan_id,
+            "url": url,
+            "domain": domain,
+            "title": title,
+            "keyword": keyword,
+            "occurrences": occurrences,
+            "contexts": json.loads(contexts),
+        }
+
+    def page_results(self, scan_id, limit=None):
+        """
+        Read the findings of a scan back in the NDJSON layout, one dict per page.
+
+        Args:
+            scan_id (str): Scan identifier
+            limit (int): Maximum number of pages returned (None reads all)
+
+        Returns:
+            list: {"url", "title", "findings"} dicts in the order pages were found
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT url, title, keyword, occurrences, contexts FROM findings WHERE scan_id = ? ORDER BY id",
+                (scan_id,)
+            )
+            results = []
+            for url, title, keyword, occurrences, contexts in rows:
+                if not results or results[-1]["url"] != url:
+                    if limit is not None and len(results) >= limit:
+                        break
+                    results.append({"url": url, "title": title, "findings": []})
+                results[-1]["findings"].append({
+                    "keyword": keyword,
+                    "occurrences": occurrences,
+                    "contexts": json.loads(contexts)
+                })
+        return results
+
+    def import_directory(self, directory):
+        """
+        Index result files written before the store existed, once each.
+
+        Both the NDJSON files of streaming crawls and the JSON arrays written by
+        earlier versions are read. Every file becomes a scan named after it;
+        files already listed by a scan (e.g. those of web jobs, stored under the
+        job ID) are skipped.
+
+        Args:
+            directory (str): Results directory
+
+        Returns:
+            int: Number of files imported
+        """
+        if not os.path.isdir(directory):
+            return 0
+        # Listed first, so files of scans registered meanwhile are known below
+        names = sorted(os.listdir(directory))
+        with self._lock:
+            known = set()
+            for scan_id, files in self._conn.execute("SELECT id, files FROM scans"):
+                known.add(scan_id)
+                known.update(json.loads(files).values())
+        imported = 0
+        for name in names:
+            if name.endswith(".ndjson") and not name.endswith("_changes.ndjson"):
+                scan_id = name[:-len(".ndjson")]
+            elif name.endswith(".json") and not name.endswith("_metrics.json"):
+                scan_id = name[:-len(".json")]
+            else:
+                continue
+            if scan_id in known or name in known:
+                continue
+            path = os.path.join(directory, name)
+            csv_name = f"{scan_id}.csv"
+            files = {"json": name}
+            if os.path.exists(os.path.join(directory, csv_name)):
+                files["csv"] = csv_name
+            try:
+                results = self._read_results_file(path)
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to import {path}: {e}")
+                continue
+            keywords = sorted({finding["keyword"] for result in results for finding in result["findings"]})
+            with self._lock:
+                self.start_scan(scan_id, None, keywords, files)
+                with self._conn:
+                    self._conn.execute("UPDATE scans SET started_at = ? WHERE id = ?",
+                                       (os.path.getmtime(path), scan_id))
+                for result in results:
+                    self.add_result(scan_id, result)
+                self.finish_scan(scan_id, "completed", len(results),
+                                 sum(len(result["findings"]) for result in results))
+            known.add(scan_id)
+            imported += 1
+            logging.info(f"Imported {len(results)} results from {path}")
+        return imported
+
+    @staticmethod
+    def _read_results_file(path):
+        """Read the results of an NDJSON file or of a legacy JSON array file."""
+        if path.endswith(".ndjson"):
+            return read_ndjson(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        if not isinstance(results, list) or not all(isinstance(result, dict) and "url" in result
+                                                    and isinstance(result.get("findings"), list)
+                                                    for result in results):
+            raise ValueError("not a list of page results")
+        return results
+
+    def close(self):
+        """Write pending findings and close the database."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
@@ -0,0 +1,250 @@
+import asyncio
+import random
+import time
+
+from scheduler import parse_retry_after
+
+# Statuses worth asking again: the server is overloaded, restarting or rate limiting
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+    Connect errors, read errors and retryable statuses each have their own
+    retry budget, so a host that refuses connections is given up on quickly
+    while a slow one keeps its read retries. Waits grow exponentially from
+    `base_delay` with jitter (half fixed, half random), so workers retrying
+    together spread out. A Retry-After header replaces the computed wait; a
+    request whose wait would exceed `max_delay` is not retried.
+    """
+
+    def __init__(self, connect_retries=2, read_retries=2, status_retries=2, base_delay=1.0, max_delay=30.0,
+                 retry_statuses=RETRYABLE_STATUSES):
+        """
+        Args:
+            connect_retries (int): Retries after connection errors (refused, DNS, connect timeout)
+            read_retries (int): Retries after errors once connected (read timeout, disconnect)
+            status_retries (int): Retries after a retryable status code
+            base_delay (float): Wait before the first retry, in seconds, doubled for each retry
+            max_delay (float): Longest wait before a retry, in seconds
+            retry_statuses (iterable): Status codes that are retried
+        """
+        self.connect_retries = connect_retries
+        self.read_retries = read_retries
+        self.status_retries = status_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    @staticmethod
+    def classify(error):
+        """
+        Tell which budget an exception draws from.
+
+        Args:
+            error (Exception): Exception raised by a request
+
+        Returns:
+            str: "connect", "read", or None if the error is not retryable
+        """
+        import aiohttp
+
+        # Connection failures: nothing was sent, so retrying is always safe
+        if isinstance(error, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)):
+            return "connect"
+        # Failures after the request was sent: timeouts, dropped connections, broken bodies
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return "read"
+        return None
+
+    def backoff(self, retry):
+        """
+        Compute the wait before a retry.
+
+        Args:
+            retry (int): Number of retries already made for the request
+
+        Returns:
+            float: Seconds to wait
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** retry)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def budget(self):
+        """Return a fresh retry budget for one request."""
+        return RetryBudget(self)
+
+
+class RetryBudget:
+    """Retries left for one request, per kind of failure."""
+
+    def __init__(self, policy):
+        """
+        Args:
+            policy (RetryPolicy): Policy the budget comes from
+        """
+        self.policy = policy
+        self.retries = 0
+        self._left = {
+            "connect": policy.connect_retries,
+            "read": policy.read_retries,
+            "status": policy.status_retries,
+        }
+
+    def next_delay(self, kind, retry_after=None):
+        """
+        Consume a retry of a kind.
+
+        Args:
+            kind (str): "connect", "read" or "status" (None never retries)
+            retry_after (str): Raw Retry-After header of the response, if any
+
+        Returns:
+            float: Seconds to wait before retrying, or None if the request must not be retried
+        """
+        if kind is None or self._left[kind] <= 0:
+            return None
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.policy.backoff(self.retries)
+        elif delay > self.policy.max_delay:
+            return None
+        self._left[kind] -= 1
+        self.retries += 1
+        return delay
+
+
+class _Circuit:
+    """Breaker state of one host."""
+
+    __slots__ = ("failures", "state", "open_until", "trips", "probing")
+
+    def __init__(self):
+        self.failures = 0         # Consecutive failed requests
+        self.state = "closed"     # "closed", "open" or "abandoned"
+        self.open_until = 0.0     # Monotonic time the host may be probed again
+        self.trips = 0            # Consecutive openings without a success in between
+        self.probing = False      # Whether a trial request is in flight
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to hosts that keep failing.
+
+    After `failure_threshold` consecutive failed requests (connection errors,
+    timeouts, server errors) a host's circuit opens: its URLs stay queued but no
+    request is made for `reset_timeout` seconds. Then one trial request is let
+    through. A success closes the circuit; a failure opens it again for twice as
+    long. A host whose circuit opened `max_trips` times in a row is abandoned
+    for the rest of the crawl.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_trips=3, probe_wait=1.0):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open a host's circuit (0 disables the breaker)
+            reset_timeout (float): Seconds a circuit stays open the first time
+            max_trips (int): Openings in a row after which the host is abandoned
+            probe_wait (float): Seconds other requests wait while a trial request is in flight
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_trips = max_trips
+        self.probe_wait = probe_wait
+        self._circuits = {}
+
+        # Statistics for the current run
+        self.opened = 0
+        self.abandoned = 0
+
+    def before_request(self, host):
+        """
+        Check whether a request to a host may be sent now.
+
+        Args:
+            host (str): Host name (netloc)
+
+        Returns:
+            float: 0 if the request may go ahead, seconds to wait before trying
+                again, or None if the host was abandoned
+        """
+        circuit = self._circuits.get(host)
+        if circuit is None or circuit.state == "closed":
+            return 0.0
+        if circuit.state == "abandoned":
+            return None
+        now = time.monotonic()
+        if now < circuit.open_until:
+            return circuit.open_until - now
+        if circuit.probing:
+            return self.probe_wait
+        circuit.probing = True
+        return 0.0
+
+    def record_success(self, host):
+        """Record a request that got an answer from the host."""
+        self._circuits.pop(host, None)
+
+    def is_probing(self, host):
+        """
+        Check whether a trial request to a host is in flight.
+
+        Called right after before_request() lets a request through, this tells
+        whether that request is the trial one.
+
+        Args:
+            host (str): Host name (netloc)
+
+        Returns:
+            bool: True if a trial request is in flight
+        """
+        circuit = self._circuits.get(host)
+        return circuit is not None and circuit.probing
+
+    def release(self, host):
+        """End a trial request that got no verdict (e.g. blocked by robots.txt), so another one can be sent."""
+        circuit = self._circuits.get(host)
+        if circuit is not None:
+            circuit.probing = False
+
+    def record_failure(self, host):
+        """
+        Record a failed request to a host.
+
+        Args:
+            host (str): Host name (netloc)
+
+        Returns:
+            float: Seconds the host is paused if this failure opened its circuit,
+                None if the host was abandoned, 0 otherwise
+        """
+        if not self.failure_threshold:
+            return 0.0
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit()
+        if circuit.state == "abandoned":
+            return 0.0
+        if circuit.state == "open" and not circuit.probing:
+            return 0.0  # Requests sent before the circuit opened are still failing
+        circuit.probing = False
+        circuit.failures += 1
+        if circuit.state == "closed" and circuit.failures < self.failure_threshold:
+            return 0.0
+
+        circuit.trips += 1
+        if circuit.trips >= self.max_trips:
+            circuit.state = "abandoned"
+            self.abandoned += 1
+            return None
+        timeout = self.reset_timeout * 2 ** (circuit.trips - 1)
+        circuit.state = "open"
+        circuit.open_until = time.monotonic() + timeout
+        self.opened += 1
+        return timeout
+
+    def summary(self):
+        """Return a one-line description of circuit activity."""
+        return f"{self.opened} host pause(s), {self.abandoned} host(s) abandoned"
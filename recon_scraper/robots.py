@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from urllib.parse import quote, unquote, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+from fetch_policy import decode_text
+
+# Maximum robots.txt size read, as recommended by RFC 9309
+MAX_ROBOTS_SIZE = 500 * 1024
+
+
+class RobotsRules:
+    """
+    Parsed robots.txt of one origin, for a fixed User-Agent.
+
+    The group of rules applying to the User-Agent is selected once. Whether a
+    rule matches a path only depends on the first `len(rule)` characters of the
+    path, so decisions are memoized per path prefix of the longest rule's length:
+    most URLs are answered by a dictionary lookup instead of a scan of the rules.
+    """
+
+    MAX_DECISIONS = 10000
+
+    def __init__(self, parser, user_agent):
+        """
+        Args:
+            parser (RobotFileParser): Parsed robots.txt
+            user_agent (str): User-Agent the rules are evaluated for
+        """
+        self.parser = parser
+        self.crawl_delay = parser.crawl_delay(user_agent) if parser.mtime() else None
+        self.request_rate = parser.request_rate(user_agent) if parser.mtime() else None
+        self.sitemaps = parser.site_maps() or []
+        self._entry = None
+        if not parser.allow_all and not parser.disallow_all:
+            for entry in parser.entries:
+                if entry.applies_to(user_agent):
+                    self._entry = entry
+                    break
+            else:
+                self._entry = parser.default_entry
+        self._prefix_len = max((len(line.path) for line in self._entry.rulelines), default=0) if self._entry else 0
+        self._decisions = {}
+
+    def allowed(self, url):
+        """
+        Check whether the User-Agent may fetch a URL.
+
+        Args:
+            url (str): URL on this origin
+
+        Returns:
+            bool: True if robots.txt allows the URL
+        """
+        if self.parser.disallow_all:
+            return False
+        if self._entry is None:
+            return True
+
+        # Same normalization as RobotFileParser.can_fetch
+        parsed_url = urlparse(unquote(url))
+        path = quote(urlunparse(("", "", parsed_url.path, parsed_url.params, parsed_url.query, ""))) or "/"
+        prefix = path[:self._prefix_len]
+        decision = self._decisions.get(prefix)
+        if decision is None:
+            decision = self._entry.allowance(path)
+            if len(self._decisions) >= self.MAX_DECISIONS:
+                self._decisions.clear()
+            self._decisions[prefix] = decision
+        return decision
+
+
+class RobotsCache:
+    """
+    Fetches robots.txt per origin through the crawl session and caches the rules.
+
+    Rules are kept in memory for `ttl` seconds and, when a cache directory is
+    given, in a SQLite file so later crawls skip the fetch. Concurrent requests
+    for an origin wait for a single fetch. As with RobotFileParser, a 401/403
+    answer disallows everything and any other 4xx allows everything; a server
+    error or an unreachable host disallows the origin for `error_ttl` seconds.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS robots (
+            origin TEXT PRIMARY KEY,
+            status INTEGER NOT NULL,
+            body TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, user_agent, cache_dir=None, ttl=86400, error_ttl=300, timeout=10.0, on_rules=None):
+        """
+        Args:
+            user_agent (str): User-Agent rules are evaluated for
+            cache_dir (str): Directory holding the robots database (None keeps rules in memory only)
+            ttl (float): Seconds fetched rules are reused
+            error_ttl (float): Seconds an origin stays disallowed after a failed fetch
+            timeout (float): Timeout of a robots.txt request in seconds
+            on_rules (callable): Called with (host, RobotsRules) whenever rules for a host are loaded
+        """
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.on_rules = on_rules
+        self._rules = {}     # origin -> (expires_at, RobotsRules)
+        self._fetches = {}   # origin -> Task fetching its robots.txt
+        self._conn = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(cache_dir, "robots.db"))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    async def can_fetch(self, url, session):
+        """
+        Check a URL against the robots.txt of its origin, fetching it if needed.
+
+        Args:
+            url (str): URL to check
+            session: aiohttp ClientSession
+
+        Returns:
+            bool: True if the URL may be crawled
+        """
+        rules = await self.rules_for(url, session)
+        return rules.allowed(url)
+
+    async def rules_for(self, url, session):
+        """
+        Get the robots.txt rules for the origin of a URL, fetching them if needed.
+
+        Args:
+            url (str): Any URL on the origin
+            session: aiohttp ClientSession
+
+        Returns:
+            RobotsRules: Rules of the origin
+        """
+        parsed_url = urlparse(url)
+        origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        cached = self._rules.get(origin)
+        if cached is not None and cached[0] >= time.time():
+            return cached[1]
+        task = self._fetches.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(self._load(origin, session))
+            self._fetches[origin] = task
+            task.add_done_callback(lambda _: self._fetches.pop(origin, None))
+        # Shielded so a cancelled worker does not abort the fetch other workers wait for
+        return await asyncio.shield(task)
+
+    async def _load(self, origin, session):
+        now = time.time()
+        stored = self._read_stored(origin, now)
+        if stored is not None:
+            status, body, fetched_at = stored
+            expires_at = fetched_at + self.ttl
+        else:
+            status, body = await self._fetch(origin, session)
+            if status is None or status >= 500:
+                expires_at = now + self.error_ttl
+            else:
+                expires_at = now + self.ttl
+                self._write_stored(origin, status, body, now)
+
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        if status == 200:
+            parser.parse(body.splitlines())
+        elif status in (401, 403) or status is None or status >= 500:
+            parser.disallow_all = True
+        else:
+            parser.allow_all = True
+        rules = RobotsRules(parser, self.user_agent)
+        self._rules[origin] = (expires_at, rules)
+        if self.on_rules is not None:
+            self.on_rules(urlparse(origin).netloc, rules)
+        return rules
+
+    async def _fetch(self, origin, session):
+        """Download robots.txt; returns (status, body), with a None status if the request failed."""
+        import aiohttp
+
+        robots_url = f"{origin}/robots.txt"
+        try:
+            async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status != 200:
+                    logging.warning(f"No robots.txt found at {robots_url} (status {response.status})")
+                    return response.status, ""
+                body = b""
+                while len(body) < MAX_ROBOTS_SIZE:
+                    chunk = await response.content.read(MAX_ROBOTS_SIZE - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+                logging.info(f"Parsed robots.txt from {robots_url}")
+                return 200, decode_text(body, response.charset)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Error accessing {robots_url}: {e}")
+            return None, ""
+
+    def _read_stored(self, origin, now):
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT status, body, fetched_at FROM robots WHERE origin = ?",
+                                 (origin,)).fetchone()
+        if row is None or row[2] + self.ttl < now:
+            return None
+        return row
+
+    def _write_stored(self, origin, status, body, fetched_at):
+        if self._conn is None:
+            return
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO robots (origin, status, body, fetched_at) VALUES (?, ?, ?, ?)",
+                               (origin, status, body, fetched_at))
+
+    def close(self):
+        """Close the robots database."""
+        if self._conn is not None:
+            self._conn.close()
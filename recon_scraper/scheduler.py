@@ -0,0 +1,296 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _HostState:
+    """Politeness state and pending URLs for a single host."""
+
+    def __init__(self):
+        self.pending = deque()
+        self.next_at = 0.0        # Monotonic time of the next allowed request
+        self.robots_delay = 0.0   # From Crawl-delay / Request-rate
+        self.latency = None       # Moving average of response latency
+        self.backoff = 1.0        # Multiplier raised by 429/503 responses
+        self.scheduled = False    # Whether the host has an entry in the ready heap
+
+
+class HostScheduler:
+    """
+    Crawl queue that enforces a minimum interval between requests to each host.
+
+    URLs are kept in one queue per host, and hosts are ordered by the time their
+    next request is allowed. A worker waiting on `get()` is therefore handed work
+    for whichever host becomes available first, instead of sleeping on a slow host
+    while others are idle. It exposes the same `put`/`get`/`task_done`/`join`
+    protocol as `asyncio.Queue`.
+
+    Each URL is only ever queued once: `put()` ignores URLs that were queued
+    before, so a link found on many pages costs one set lookup instead of a
+    queue entry per page. Per-host queues are deques, so both ends are O(1).
+
+    The interval for a host is the largest of:
+      - the base delay (randomized by `jitter`),
+      - the robots.txt Crawl-delay or Request-rate for the host,
+      - the observed response latency divided by `host_concurrency`,
+    multiplied by a backoff factor that doubles on 429/503 and decays on success.
+    A Retry-After header additionally holds the host until the given time.
+    """
+
+    BACKOFF_STATUSES = (429, 503)
+
+    def __init__(self, delay=0.5, jitter=0.5, host_concurrency=1, max_backoff=32.0, max_pending=None):
+        """
+        Args:
+            delay (float): Base interval between two requests to the same host
+            jitter (float): Random +/- fraction applied to the base interval
+            host_concurrency (int): Requests per host allowed to overlap when
+                pacing by observed latency
+            max_backoff (float): Upper bound for the 429/503 backoff multiplier
+            max_pending (int): Maximum queued URLs; further URLs are refused (None for no limit)
+        """
+        self.delay = delay
+        self.jitter = jitter
+        self.host_concurrency = max(1, host_concurrency)
+        self.max_backoff = max_backoff
+        self.max_pending = max_pending
+        self._hosts = {}
+        self._seen = set()  # Every URL queued so far
+        self._pending = 0
+        self._ready = []  # Heap of (ready_at, seq, host)
+        self._seq = itertools.count()
+        self._unfinished = 0
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def _interval(self, state):
+        """Compute the spacing to apply after dispatching a request to a host."""
+        interval = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        interval = max(interval, state.robots_delay)
+        if state.latency is not None:
+            interval = max(interval, state.latency / self.host_concurrency)
+        return interval * state.backoff
+
+    def set_robots(self, host, crawl_delay=None, request_rate=None):
+        """
+        Apply robots.txt pacing rules to a host.
+
+        Args:
+            host (str): Host name (netloc)
+            crawl_delay (float): Value of RobotFileParser.crawl_delay()
+            request_rate: Value of RobotFileParser.request_rate()
+        """
+        delay = float(crawl_delay or 0)
+        if request_rate and request_rate.requests:
+            delay = max(delay, request_rate.seconds / request_rate.requests)
+        self._host(host).robots_delay = delay
+
+    def record_response(self, url, latency, status, retry_after=None):
+        """
+        Feed back the outcome of a request so the host's pacing can adapt.
+
+        Args:
+            url (str): Requested URL
+            latency (float): Seconds until the response headers were received
+            status (int): HTTP status code
+            retry_after (str): Raw Retry-After header, if any
+        """
+        state = self._host(urlparse(url).netloc)
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency = 0.7 * state.latency + 0.3 * latency
+
+        if status in self.BACKOFF_STATUSES:
+            state.backoff = min(state.backoff * 2, self.max_backoff)
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = self._interval(state)
+            state.next_at = max(state.next_at, time.monotonic() + wait)
+        elif status < 500:
+            state.backoff = max(1.0, state.backoff / 2)
+
+    def mark_seen(self, urls):
+        """
+        Record URLs that must not be queued again, e.g. visited URLs of a resumed crawl.
+
+        Args:
+            urls (iterable): URLs already handled
+        """
+        self._seen.update(urls)
+
+    def put(self, url, depth):
+        """
+        Queue a URL for crawling unless it was queued before.
+
+        Args:
+            url (str): Canonical URL to crawl
+            depth (int): Crawl depth of the URL
+
+        Returns:
+            bool: True if the URL was added to the queue
+        """
+        if url in self._seen:
+            return False
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            return False  # Not marked as seen, so it can be queued again later
+        self._seen.add(url)
+
+        host = urlparse(url).netloc
+        state = self._host(host)
+        state.pending.append((url, depth))
+        self._pending += 1
+        self._unfinished += 1
+        self._finished.clear()
+        if not state.scheduled:
+            state.scheduled = True
+            heapq.heappush(self._ready, (state.next_at, next(self._seq), host))
+        self._changed.set()
+        return True
+
+    def requeue(self, url, depth):
+        """
+        Put back a URL returned by `get()` that could not be handled yet.
+
+        Unlike `put()`, the URL is queued even though it was seen before, and
+        regardless of `max_pending`.
+
+        Args:
+            url (str): Canonical URL
+            depth (int): Crawl depth of the URL
+        """
+        host = urlparse(url).netloc
+        state = self._host(host)
+        state.pending.append((url, depth))
+        self._pending += 1
+        self._unfinished += 1
+        self._finished.clear()
+        if not state.scheduled:
+            state.scheduled = True
+            heapq.heappush(self._ready, (state.next_at, next(self._seq), host))
+        self._changed.set()
+
+    def pause(self, host, seconds):
+        """
+        Hold back the URLs of a host, e.g. while it is failing.
+
+        Args:
+            host (str): Host name (netloc)
+            seconds (float): Seconds before the host's next request
+        """
+        state = self._host(host)
+        state.next_at = max(state.next_at, time.monotonic() + seconds)
+
+    async def get(self):
+        """
+        Wait for the next URL whose host is allowed to be requested.
+
+        Returns:
+            tuple: (url, depth)
+        """
+        while True:
+            self._changed.clear()
+            now = time.monotonic()
+
+            # Hosts pushed back by Retry-After after being queued are re-filed
+            while self._ready:
+                ready_at, _, host = self._ready[0]
+                next_at = self._hosts[host].next_at
+                if next_at <= ready_at:
+                    break
+                heapq.heapreplace(self._ready, (next_at, next(self._seq), host))
+
+            if self._ready and self._ready[0][0] <= now:
+                _, _, host = heapq.heappop(self._ready)
+                state = self._hosts[host]
+                item = state.pending.popleft()
+                self._pending -= 1
+                state.next_at = now + self._interval(state)
+                if state.pending:
+                    heapq.heappush(self._ready, (state.next_at, next(self._seq), host))
+                else:
+                    state.scheduled = False
+                return item
+
+            timeout = self._ready[0][0] - now if self._ready else None
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def task_done(self):
+        """Mark an item returned by `get()` as processed."""
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._finished.set()
+
+    async def join(self):
+        """Wait until every queued item has been processed."""
+        await self._finished.wait()
+
+    def clear(self, host=None):
+        """
+        Drop pending URLs, e.g. once a crawl budget is exhausted.
+
+        Args:
+            host (str): Only drop the URLs of this host (None drops every pending URL)
+        """
+        if host is None:
+            states = self._hosts.values()
+            self._ready = []
+        else:
+            state = self._hosts.get(host)
+            if state is None or not state.pending:
+                return
+            states = [state]
+            self._ready = [entry for entry in self._ready if entry[2] != host]
+            heapq.heapify(self._ready)
+        for state in states:
+            self._unfinished -= len(state.pending)
+            self._pending -= len(state.pending)
+            state.pending.clear()
+            state.scheduled = False
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._finished.set()
+
+    def qsize(self):
+        """Return the number of pending URLs across all hosts."""
+        return self._pending
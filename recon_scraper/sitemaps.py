@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from url_utils import canonicalize_url
+
+# Limits from the sitemaps protocol: 50,000 URLs and 50 MB (uncompressed) per file
+MAX_SITEMAP_SIZE = 50 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_lastmod(value):
+    """
+    Parse a sitemap <lastmod> value (W3C datetime).
+
+    Args:
+        value (str): e.g. "2024-05-01" or "2024-05-01T10:00:00+02:00"
+
+    Returns:
+        float: POSIX timestamp, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1]
+
+
+async def _stream_sitemap(session, sitemap_url):
+    """
+    Download and parse a sitemap incrementally.
+
+    The body is fed to the XML parser chunk by chunk (inflating gzipped files on
+    the fly) and every parsed entry is dropped from the tree, so memory stays
+    flat whatever the size of the sitemap.
+
+    Args:
+        session: aiohttp ClientSession
+        sitemap_url (str): Sitemap or sitemap index URL
+
+    Yields:
+        tuple: ("url" or "sitemap", loc, lastmod timestamp or None)
+    """
+    async with session.get(sitemap_url) as response:
+        if response.status != 200:
+            logging.warning(f"No sitemap at {sitemap_url} (status {response.status})")
+            return
+
+        parser = XMLPullParser(events=("start", "end"))
+        inflater = None
+        root = None
+        size = 0
+        first_chunk = True
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            # .gz files are usually served as-is, without a Content-Encoding aiohttp would undo
+            if first_chunk:
+                first_chunk = False
+                if chunk.startswith(GZIP_MAGIC):
+                    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data = [chunk]
+            if inflater is not None:
+                data = [inflater.decompress(chunk, CHUNK_SIZE)]
+                while inflater.unconsumed_tail:
+                    data.append(inflater.decompress(inflater.unconsumed_tail, CHUNK_SIZE))
+
+            for block in data:
+                size += len(block)
+                if size > MAX_SITEMAP_SIZE:
+                    logging.warning(f"Sitemap {sitemap_url} exceeds {MAX_SITEMAP_SIZE} bytes, truncated")
+                    return
+                parser.feed(block)
+                for event, element in parser.read_events():
+                    if event == "start":
+                        if root is None:
+                            root = element
+                        continue
+                    name = _local_name(element.tag)
+                    if name not in ("url", "sitemap"):
+                        continue
+                    loc = lastmod = None
+                    for child in element:
+                        child_name = _local_name(child.tag)
+                        if child_name == "loc":
+                            loc = (child.text or "").strip()
+                        elif child_name == "lastmod":
+                            lastmod = parse_lastmod(child.text)
+                    if loc:
+                        yield name, loc, lastmod
+                    root.clear()  # Entries are direct children of the root; drop the ones handled
+
+
+async def collect_sitemap_urls(session, sitemap_urls, domain, limit, allowed=None, max_sitemaps=50):
+    """
+    Read sitemaps (following sitemap indexes) and pick the URLs to seed a crawl with.
+
+    Args:
+        session: aiohttp ClientSession
+        sitemap_urls (list): Sitemap or sitemap index URLs to start from
+        domain (str): Only URLs on this netloc are kept, and only sitemaps on it
+            are followed from a sitemap index
+        limit (int): Maximum number of URLs returned
+        allowed (callable): Filter applied to each canonical URL, e.g. robots.txt rules
+        max_sitemaps (int): Maximum number of sitemap files fetched
+
+    Returns:
+        list: Canonical URLs, most recently modified first (URLs without lastmod last)
+    """
+    import aiohttp
+
+    pending = list(dict.fromkeys(sitemap_urls))
+    fetched = set()
+    # Min-heap of (lastmod, -order, url) holding the `limit` most recent URLs; only
+    # these are kept in memory, however many URLs the sitemaps list
+    best = []
+    kept = set()
+    order = itertools.count()
+
+    while pending and len(fetched) < max_sitemaps:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in fetched:
+            continue
+        fetched.add(sitemap_url)
+        count = 0
+        try:
+            async for kind, loc, lastmod in _stream_sitemap(session, sitemap_url):
+                if kind == "sitemap":
+                    # An index must not send the crawler to other hosts, past their robots.txt and pacing
+                    if urlparse(canonicalize_url(loc)).netloc != domain:
+                        logging.info(f"Skipping sitemap {loc} listed by {sitemap_url}: not on {domain}")
+                    elif loc not in fetched:
+                        pending.append(loc)
+                    continue
+                url = canonicalize_url(loc)
+                if url in kept or urlparse(url).netloc != domain:
+                    continue
+                if allowed is not None and not allowed(url):
+                    continue
+                count += 1
+                # Earlier entries win ties, keeping the sitemap's own order
+                entry = (lastmod if lastmod is not None else float("-inf"), -next(order), url)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                    kept.add(url)
+                elif entry > best[0]:
+                    kept.discard(heapq.heapreplace(best, entry)[2])
+                    kept.add(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ParseError, zlib.error) as e:
+            logging.error(f"Failed to read sitemap {sitemap_url}: {e}")
+            continue
+        logging.info(f"Read {count} URLs from sitemap {sitemap_url}")
+
+    return [url for _, _, url in sorted(best, reverse=True)]
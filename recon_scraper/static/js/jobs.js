@@ -0,0 +1,78 @@
+// Client for background scan jobs: submit a scan, follow its progress, get its results.
+//
+// Progress is streamed with server-sent events; if the browser cannot keep the
+// event stream open, the job status is polled instead.
+function runScanJob(payload, onProgress) {
+    const notify = onProgress || function() {};
+
+    return fetch('/api/scrape', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(payload)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            throw new Error(data.error);
+        }
+        notify(data);
+        return waitForJob(data, notify);
+    })
+    .then(job => {
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Scan failed');
+        }
+        return job.result;
+    });
+}
+
+function waitForJob(job, notify) {
+    return new Promise((resolve, reject) => {
+        const finish = () => {
+            fetch(job.status_url)
+                .then(response => response.json())
+                .then(resolve)
+                .catch(reject);
+        };
+
+        const poll = () => {
+            fetch(job.status_url)
+                .then(response => response.json())
+                .then(state => {
+                    notify(state);
+                    if (state.status === 'completed' || state.status === 'failed') {
+                        resolve(state);
+                    } else {
+                        setTimeout(poll, 2000);
+                    }
+                })
+                .catch(reject);
+        };
+
+        if (!window.EventSource) {
+            poll();
+            return;
+        }
+
+        const events = new EventSource(job.events_url);
+        ['queued', 'running'].forEach(name => {
+            events.addEventListener(name, e => notify(JSON.parse(e.data)));
+        });
+        ['completed', 'failed'].forEach(name => {
+            events.addEventListener(name, e => {
+                events.close();
+                notify(JSON.parse(e.data));
+                finish();
+            });
+        });
+        events.onerror = () => {
+            // The stream is closed by the server once the job ends; anything else falls back to polling
+            if (events.readyState !== EventSource.OPEN) {
+                events.close();
+                poll();
+            }
+        };
+    });
+}
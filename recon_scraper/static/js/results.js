@@ -0,0 +1,110 @@
+// Findings search on the results page, backed by /api/findings.
+//
+// Findings are loaded one page at a time: the API returns a `next` cursor that
+// is passed back as `before`, so large scans are never loaded whole.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('findingsForm');
+    if (!form) {
+        return;
+    }
+    const table = document.getElementById('findingsTable');
+    const moreButton = document.getElementById('findingsMore');
+    const emptyNotice = document.getElementById('findingsEmpty');
+    const scanFilter = document.getElementById('scanFilter');
+    const scanNotice = document.getElementById('scanFilterNotice');
+    let nextCursor = null;
+
+    function cell(text) {
+        const td = document.createElement('td');
+        td.textContent = text;
+        return td;
+    }
+
+    function addRow(finding) {
+        const row = document.createElement('tr');
+
+        const urlCell = document.createElement('td');
+        const link = document.createElement('a');
+        link.href = finding.url;
+        link.target = '_blank';
+        link.rel = 'noopener noreferrer';
+        link.className = 'url-badge';
+        link.textContent = finding.url;
+        urlCell.appendChild(link);
+        if (finding.title) {
+            const title = document.createElement('div');
+            title.className = 'text-muted small';
+            title.textContent = finding.title;
+            urlCell.appendChild(title);
+        }
+        row.appendChild(urlCell);
+
+        row.appendChild(cell(finding.keyword));
+        row.appendChild(cell(finding.occurrences));
+        row.appendChild(cell(finding.contexts.length ? finding.contexts[0] : ''));
+        table.appendChild(row);
+    }
+
+    function load(reset) {
+        const params = new URLSearchParams();
+        new FormData(form).forEach((value, key) => {
+            if (value.trim()) {
+                params.set(key, value.trim());
+            }
+        });
+        if (!reset && nextCursor !== null) {
+            params.set('before', nextCursor);
+        }
+
+        return fetch(`/api/findings?${params}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    throw new Error(data.error);
+                }
+                if (reset) {
+                    table.innerHTML = '';
+                }
+                data.findings.forEach(addRow);
+                nextCursor = data.next;
+                emptyNotice.textContent = 'No findings match.';
+                moreButton.style.display = nextCursor !== null ? 'inline-block' : 'none';
+                emptyNotice.style.display = table.children.length ? 'none' : 'block';
+            })
+            .catch(error => {
+                emptyNotice.textContent = `Error: ${error.message}`;
+                emptyNotice.style.display = 'block';
+            });
+    }
+
+    function showScan(scanId) {
+        scanFilter.value = scanId || '';
+        scanNotice.style.display = scanId ? 'block' : 'none';
+        document.getElementById('scanFilterName').textContent = scanId || '';
+        load(true);
+    }
+
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+        load(true);
+    });
+
+    moreButton.addEventListener('click', function() {
+        load(false);
+    });
+
+    document.getElementById('clearScanFilter').addEventListener('click', function(e) {
+        e.preventDefault();
+        showScan(null);
+    });
+
+    document.querySelectorAll('.scan-findings').forEach(button => {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            showScan(this.dataset.scan);
+            form.scrollIntoView({ behavior: 'smooth' });
+        });
+    });
+
+    load(true);
+});
@@ -163,34 +163,31 @@ document.addEventListener('DOMContentLoaded', function() {
             addLog(`Ignore robots.txt: ${ignoreRobots}`);
             
             // Make API request
-            fetch('/api/scrape', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    url: url,
-                    keywords: window.keywords.join(','),
-                    depth: parseInt(depth),
-                    max_urls: parseInt(maxUrls),
-                    ignore_robots: ignoreRobots
-                })
+            runScanJob({
+                url: url,
+                keywords: window.keywords.join(','),
+                depth: parseInt(depth),
+                max_urls: parseInt(maxUrls),
+                ignore_robots: ignoreRobots
+            }, state => {
+                if (state.progress) {
+                    const p = state.progress;
+                    addLog(`${state.status}: ${p.pages} URLs visited, ${p.findings} results, ${p.queued} queued`);
+                }
             })
-            .then(response => response.json())
             .then(data => {
-                if (!data.error) {
+                if (data) {
                     // Update download files
                     window.downloadFiles = data.files;
                     
                     // Update counters
                     document.getElementById('visitedUrlsCount').textContent = data.visitedUrls;
-                    document.getElementById('resultsCount').textContent = data.results.length;
+                    document.getElementById('resultsCount').textContent = data.resultsCount;
                     
                     // Success logs
                     addLog(`Reconnaissance completed successfully`);
                     addLog(`${data.visitedUrls} URLs visited`);
-                    addLog(`${data.results.length} results found`);
-                    if (data.log) {
-                        addLog(data.log);
-                    }
+                    addLog(`${data.resultsCount} results found`);
                     
                     // Fill the results table
                     const resultsTable = document.getElementById('resultsTable');
@@ -227,8 +224,6 @@ document.addEventListener('DOMContentLoaded', function() {
                     // Display results
                     document.getElementById('loadingIndicator').style.display = 'none';
                     document.getElementById('resultsContainer').style.display = 'block';
-                } else {
-                    throw new Error(data.error || 'Error during the request');
                 }
                 
                 // Reset button state
@@ -370,21 +365,20 @@ document.addEventListener('DOMContentLoaded', function() {
             addLog(`Ignore robots.txt: ${ignoreRobots}`);
             
             // Make the API request
-            fetch('/api/scrape', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({
-                    url: url,
-                    keywords: keywordsToSend.join(','),
-                    depth: parseInt(depth),
-                    max_urls: parseInt(maxUrls),
-                    ignore_robots: ignoreRobots
-                })
+            runScanJob({
+                url: url,
+                keywords: keywordsToSend.join(','),
+                depth: parseInt(depth),
+                max_urls: parseInt(maxUrls),
+                ignore_robots: ignoreRobots
+            }, state => {
+                if (state.progress) {
+                    const p = state.progress;
+                    addLog(`${state.status}: ${p.pages} URLs visited, ${p.findings} results, ${p.queued} queued`);
+                }
             })
-            .then(response => response.json())
-            .then(data => {                if (!data.error) {
+            .then(data => {
+                if (data) {
                     // Update download files
                     if (window.downloadFiles) {
                         window.downloadFiles = data.files;
@@ -392,15 +386,12 @@ document.addEventListener('DOMContentLoaded', function() {
                     
                     // Update counters
                     document.getElementById('visitedUrlsCount').textContent = data.visitedUrls;
-                    document.getElementById('resultsCount').textContent = data.results.length;
+                    document.getElementById('resultsCount').textContent = data.resultsCount;
                     
                     // Success logs
                     addLog(`Reconnaissance completed successfully`);
                     addLog(`${data.visitedUrls} URLs visited`);
-                    addLog(`${data.results.length} results found`);
-                    if (data.log) {
-                        addLog(data.log);
-                    }
+                    addLog(`${data.resultsCount} results found`);
                     
                     // Fill the results table
                     const resultsTable = document.getElementById('resultsTable');
@@ -437,8 +428,6 @@ document.addEventListener('DOMContentLoaded', function() {
                     // Display results
                     document.getElementById('loadingIndicator').style.display = 'none';
                     document.getElementById('resultsContainer').style.display = 'block';
-                } else {
-                    throw new Error(data.error || 'Error during the request');
                 }
                 
                 // Reset button state
@@ -0,0 +1,73 @@
+from urllib.parse import urlparse
+
+from url_utils import canonicalize_url
+
+
+class CrawlTarget:
+    """A seed site of a crawl with its own page budget and depth."""
+
+    def __init__(self, url, max_urls=100, depth=1):
+        """
+        Args:
+            url (str): Seed URL
+            max_urls (int): Maximum number of URLs to crawl on this site
+            depth (int): Crawling depth from the seed URL
+        """
+        self.url = url
+        self.max_urls = max_urls
+        self.depth = depth
+        self.start_url = canonicalize_url(url)
+        parsed_url = urlparse(self.start_url)
+        self.domain = parsed_url.netloc
+        self.scheme = parsed_url.scheme
+        self.visited = 0
+
+    @property
+    def exhausted(self):
+        """Whether the page budget of this site is used up."""
+        return self.visited >= self.max_urls
+
+    def to_dict(self):
+        """Return the settings needed to rebuild this target, e.g. from a saved crawl state."""
+        return {"url": self.url, "max_urls": self.max_urls, "depth": self.depth}
+
+
+def load_targets(path, max_urls=100, depth=1):
+    """
+    Read the targets of a batch scan.
+
+    Each non-empty line holds a seed URL, optionally followed by `max_urls=N`
+    and/or `depth=N` overriding the defaults for that site. Lines starting with
+    `#` are comments. A URL without a scheme gets `https://`.
+
+        https://example.com max_urls=500 depth=3
+        example.org
+
+    Args:
+        path (str): Targets file
+        max_urls (int): Default page budget per site
+        depth (int): Default crawling depth
+
+    Returns:
+        list: CrawlTarget objects, one per domain (later duplicates are ignored)
+    """
+    targets = []
+    domains = set()
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            url = fields[0] if "://" in fields[0] else f"https://{fields[0]}"
+            options = {"max_urls": max_urls, "depth": depth}
+            for field in fields[1:]:
+                name, _, value = field.partition("=")
+                if name not in options or not value.isdigit():
+                    raise ValueError(f"{path}:{line_number}: invalid option '{field}'")
+                options[name] = int(value)
+            target = CrawlTarget(url, **options)
+            if target.domain in domains:
+                continue
+            domains.add(target.domain)
+            targets.append(target)
+    return targets
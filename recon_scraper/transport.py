@@ -0,0 +1,118 @@
+try:
+    import brotli  # noqa: F401  (aiohttp decodes "br" when a brotli module is installed)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class TransportConfig:
+    """Connection pool, DNS cache and timeout settings for the crawl session."""
+
+    def __init__(self, limit=None, limit_per_host=None, keepalive_timeout=30.0, dns_ttl=300,
+                 compression=True, connect_timeout=10.0, read_timeout=15.0, total_timeout=None):
+        """
+        Args:
+            limit (int): Maximum open connections (default: the crawl concurrency)
+            limit_per_host (int): Maximum open connections per host (default: same as limit)
+            keepalive_timeout (float): Seconds an idle connection is kept for reuse
+            dns_ttl (int): Seconds DNS results are cached (None caches forever)
+            compression (bool): Ask servers for gzip/deflate (and br if available) responses
+            connect_timeout (float): Seconds to acquire a connection and connect
+            read_timeout (float): Maximum seconds between two reads of the response
+            total_timeout (float): Upper bound for a whole request (None for no limit)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.compression = compression
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+
+
+class ConnectionStats:
+    """Connection reuse and DNS cache counters, fed by aiohttp tracing hooks."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    def trace_config(self):
+        """Build the aiohttp TraceConfig updating these counters."""
+        import aiohttp
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(self, session, context, params):
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, session, context, params):
+        self.dns_cache_misses += 1
+
+    def summary(self):
+        """Return a one-line description of connection reuse."""
+        connections = self.connections_created + self.connections_reused
+        reuse_rate = 100.0 * self.connections_reused / connections if connections else 0.0
+        return (f"{self.requests} requests, {self.connections_created} connections opened, "
+                f"{self.connections_reused} reused ({reuse_rate:.1f}%), "
+                f"DNS cache {self.dns_cache_hits} hits / {self.dns_cache_misses} misses")
+
+
+def create_session(config, stats=None, headers=None, concurrency=10, metrics=None):
+    """
+    Create the aiohttp session shared by all crawl workers.
+
+    Args:
+        config (TransportConfig): Transport settings
+        stats (ConnectionStats): Counters to update (None disables tracing)
+        headers (dict): Default headers sent with every request
+        concurrency (int): Crawl concurrency, used for unset connection limits
+        metrics (CrawlMetrics): Metrics receiving request latencies (None disables them)
+
+    Returns:
+        aiohttp.ClientSession: Configured session
+    """
+    # aiohttp is only imported once a crawl starts, which keeps the CLI and web app quick to load
+    import aiohttp
+
+    limit = config.limit or concurrency
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=config.limit_per_host or limit,
+        keepalive_timeout=config.keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=config.dns_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.total_timeout,
+        connect=config.connect_timeout,
+        sock_read=config.read_timeout,
+    )
+    session_headers = dict(headers or {})
+    session_headers["Accept-Encoding"] = ACCEPT_ENCODING if config.compression else "identity"
+    trace_configs = [tracer.trace_config() for tracer in (stats, metrics) if tracer is not None]
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers=session_headers,
+        trace_configs=trace_configs or None,
+    )
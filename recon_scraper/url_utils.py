@@ -0,0 +1,46 @@
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url):
+    """
+    Normalize a URL so that equivalent spellings map to the same string.
+
+    - scheme and host are lowercased, default ports are dropped
+    - the fragment is removed
+    - query parameters are sorted (their encoding is kept as is) and an empty
+      query is dropped
+    - an empty path becomes "/"; a trailing slash is kept, since relative
+      links on `/a/` resolve differently than on `/a`
+
+    `http://X:80/a?#frag`, `http://x/a#frag` and `http://x/a` all become `http://x/a`.
+
+    Args:
+        url (str): Absolute URL
+
+    Returns:
+        str: Canonical URL (the input unchanged if it cannot be parsed)
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    netloc = host
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username if parts.password is None else f"{parts.username}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path or "/"
+
+    query = "&".join(sorted(param for param in parts.query.split("&") if param))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -1,16 +1,14 @@
-import asyncio
 import json
 import os
 import time
 import logging
-from urllib.parse import urlparse
 
 import flask
 from flask import Flask, render_template, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 
-# Import the updated ReconScraper
-from recon_scraper import ReconScraper
+from detectors import resolve_detectors
+from jobs import JobManager, ScanJob
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,6 +20,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 app.config['UPLOAD_FOLDER'] = os.path.join(current_dir, 'results')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# Scans run in the background so requests return immediately
+jobs = JobManager(app.config['UPLOAD_FOLDER'])
+
 # Log the absolute path
 logging.info(f"Upload folder absolute path: {app.config['UPLOAD_FOLDER']}")
 
@@ -58,55 +59,65 @@ def scrape():
         return jsonify({'error': 'Target URL required', 'log': 'Check scraper.log for details'}), 400
     
     keywords = [k.strip() for k in keywords if k.strip()]
-    
+    detectors = [d.strip() for d in data.get('detectors', '').split(',') if d.strip()]
     try:
-        logging.info(f"Initializing scraper for {target_url}")
-        scraper = ReconScraper(
-            target_url=target_url,
-            keywords=keywords,
-            depth=depth,
-            output_dir=app.config['UPLOAD_FOLDER'],  # Use the absolute path from app.config
-            max_urls=max_urls,
-            ignore_robots=ignore_robots
-        )
-        
-        logging.info("Running scraper crawl")
-        asyncio.run(scraper.crawl())
-        
-        logging.info("Saving scraper results")
-        scraper.save_results()
-        
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        base_filename = f"recon_{urlparse(target_url).netloc}_{timestamp}"
-        json_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{base_filename}.json")
-        csv_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{base_filename}.csv")
-        
-        results = []
-        if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                results = json.load(f)
-        else:
-            logging.warning(f"JSON file not found: {json_path}")
-        
-        logging.info(f"Scrape completed with {len(scraper.results)} results")
-        return jsonify({
-            'status': 'success',
-            'message': f'Scraping completed with {len(scraper.results)} results',
-            'visitedUrls': len(scraper.visited_urls),
-            'results': results,
-            'files': {
-                'json': f"{base_filename}.json" if os.path.exists(json_path) else '',
-                'csv': f"{base_filename}.csv" if os.path.exists(csv_path) else ''
-            },
-            'log': 'Check scraper.log for detailed request and error information'
-        })
-        
-    except Exception as e:
-        logging.error(f"Scrape failed: {str(e)}", exc_info=True)
-        return jsonify({
-            'error': f'Scraping failed: {str(e)}',
-            'log': 'Check scraper.log for detailed error information'
-        }), 500
+        resolve_detectors(detectors)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # The crawl runs in the background; the client follows it through the job endpoints
+    job = jobs.submit({
+        'target_url': target_url,
+        'keywords': keywords,
+        'detectors': detectors,
+        'depth': depth,
+        'max_urls': max_urls,
+        'ignore_robots': ignore_robots
+    })
+    return jsonify({
+        'status': 'queued',
+        'job_id': job.id,
+        'status_url': f"/api/jobs/{job.id}",
+        'events_url': f"/api/jobs/{job.id}/events"
+    }), 202
+
+@app.route('/api/jobs')
+def list_jobs():
+    return jsonify({'jobs': [job.to_dict(include_result=False) for job in jobs.list()]})
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job {job_id} not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream job progress as server-sent events until the job finishes."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job {job_id} not found'}), 404
+    
+    def stream():
+        state = job.to_dict(include_result=False)
+        version = 0
+        while True:
+            if state is not None:
+                yield f"event: {state['status']}\ndata: {json.dumps(state)}\n\n"
+                if state['status'] in ScanJob.FINISHED:
+                    return
+            else:
+                yield ": keep-alive\n\n"  # Stops proxies from closing an idle stream
+            state, version = job.wait_for_change(version, timeout=15)
+    
+    return flask.Response(stream(), mimetype='text/event-stream',
+                          headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics')
+def metrics():
+    """Expose crawl metrics of all scan jobs in the Prometheus text format."""
+    return flask.Response(jobs.prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/downloads/<path:filename>')
 def download_file(filename):
@@ -161,21 +172,53 @@ def download_file(filename):
         logging.error(f"Download failed: {str(e)}", exc_info=True)
         return jsonify({'error': f'Download failed: {str(e)}'}), 500
 
+def int_arg(name, default, maximum=None):
+    """Read a non-negative integer query parameter, capped at `maximum`."""
+    try:
+        value = max(0, int(request.args.get(name, default)))
+    except ValueError:
+        value = default
+    return min(value, maximum) if maximum is not None else value
+
+@app.route('/api/scans')
+def list_scans():
+    limit = int_arg('limit', 50, 500)
+    offset = int_arg('offset', 0)
+    scans, total = jobs.store.list_scans(limit=limit, offset=offset)
+    return jsonify({'scans': scans, 'total': total, 'limit': limit, 'offset': offset})
+
+@app.route('/api/scans/<scan_id>')
+def get_scan(scan_id):
+    scan = jobs.store.get_scan(scan_id)
+    if scan is None:
+        return jsonify({'error': f'Scan {scan_id} not found'}), 404
+    return jsonify(scan)
+
+@app.route('/api/findings')
+def search_findings():
+    """Query indexed findings; pass the returned `next` value as `before` to get the following page."""
+    before = request.args.get('before')
+    try:
+        findings, next_before = jobs.store.search(
+            text=request.args.get('q'),
+            keyword=request.args.get('keyword'),
+            url=request.args.get('url'),
+            domain=request.args.get('domain'),
+            scan_id=request.args.get('scan'),
+            limit=int_arg('limit', 50, 500),
+            before=int(before) if before else None
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'findings': findings, 'next': next_before})
+
 @app.route('/results')
 def list_results():
     logging.info("Serving results page")
-    files = []
-    for file in os.listdir(app.config['UPLOAD_FOLDER']):
-        if file.endswith('.json') or file.endswith('.csv'):
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], file)
-            files.append({
-                'name': file,
-                'path': f"/downloads/{file}",
-                'size': os.path.getsize(file_path),
-                'date': time.ctime(os.path.getctime(file_path))
-            })
-    
-    return render_template('results.html', files=files)
+    scans, total = jobs.store.list_scans(limit=100)
+    for scan in scans:
+        scan['date'] = time.ctime(scan['started_at'])
+    return render_template('results.html', scans=scans, total=total)
 
 if __name__ == '__main__':
     logging.info("Starting Flask app")